@@ -1,11 +1,12 @@
+import functools
 from dataclasses import dataclass
-from typing import Dict, Iterator, Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from ._deps_protocols import _RangeTypedDict
 from .conda_impl import conda_match_spec, conda_version
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CondaDepInfo:
     name: str  # The name of the dep (i.e.: python)
     value: str  # The full value of the dep (i.e.: python=3.7)
@@ -13,11 +14,43 @@ class CondaDepInfo:
     dep_range: _RangeTypedDict
 
     def get_dep_vspec(self) -> Optional[conda_version.VersionSpec]:
-        try:
-            vspec = conda_version.VersionSpec(self.version_spec)
-        except Exception:
-            return None
-        return vspec
+        return _get_vspec_cached(self.version_spec.strip())
+
+
+@functools.lru_cache(maxsize=2048)
+def _get_vspec_cached(version_spec: str) -> Optional[conda_version.VersionSpec]:
+    """
+    Provides the VersionSpec for the given (stripped) version spec or None if
+    it's not valid.
+
+    Note: VersionSpec instances are immutable and VersionSpec already caches
+    the instances which are properly created (but not the failures).
+    """
+    try:
+        return conda_version.VersionSpec(version_spec)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_spec_cached(value: str) -> Optional[Tuple[str, str]]:
+    """
+    Provides the (name, version_spec) for the given value or None if it
+    could not be parsed.
+
+    Note: `parse_spec_str` already caches the specs which are properly parsed,
+    but this also caches the ones which fail (which would otherwise be parsed
+    again in each new analysis).
+    """
+    try:
+        spec = conda_match_spec.parse_spec_str(value)
+
+        # It may not have a version if it wasn't specified.
+        version_spec = spec.get("version", "*")
+        name = spec["name"]
+    except Exception:
+        return None
+    return name, version_spec
 
 
 class CondaDeps:
@@ -30,15 +63,9 @@ class CondaDeps:
             value: This is the value found in the spec. Something as:
             'python==3.7'.
         """
-        try:
-            spec = conda_match_spec.parse_spec_str(value)
-
-            # It may not have a version if it wasn't specified.
-            version_spec = spec.get("version", "*")
-            name = spec["name"]
-        except Exception:
-            pass
-        else:
+        parsed = _parse_spec_cached(value)
+        if parsed is not None:
+            name, version_spec = parsed
             self._deps[name] = CondaDepInfo(name, value, version_spec, dep_range)
 
     def get_dep_vspec(self, spec_name: str) -> Optional[conda_version.VersionSpec]:
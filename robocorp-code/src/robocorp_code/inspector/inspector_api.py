@@ -1,9 +1,10 @@
 import threading
 import typing
 from queue import Queue
-from typing import Literal, Optional
+from typing import Any, Callable, Literal, Optional
 
 from robocorp_ls_core.basic import overrides
+from robocorp_ls_core.jsonrpc.streams import JsonRpcStreamWriter
 from robocorp_ls_core.protocols import ActionResultDict, IConfig, IEndPoint
 from robocorp_ls_core.python_ls import PythonLanguageServer
 from robocorp_ls_core.robotframework_log import get_logger
@@ -486,6 +487,19 @@ class _WindowsStopHighlight(_WindowsBaseCommand):
         return {"success": True, "message": None, "result": None}
 
 
+def create_fast_json_encoder() -> Optional[Callable[[Any], bytes]]:
+    """
+    Provides a function which encodes a message directly to utf-8 bytes using
+    `msgspec` (a C-accelerated encoder) or None if it's not available.
+    """
+    try:
+        import msgspec
+    except ImportError:
+        return None
+
+    return msgspec.json.Encoder().encode
+
+
 class InspectorApi(PythonLanguageServer):
     """
     This is a custom server. It uses the same message-format used in the language
@@ -498,6 +512,12 @@ class InspectorApi(PythonLanguageServer):
         self.__web_inspector_thread: Optional[_WebInspectorThread] = None
         self.__windows_inspector_thread: Optional[_WindowsInspectorThread] = None
 
+    @overrides(PythonLanguageServer._create_jsonrpc_stream_writer)
+    def _create_jsonrpc_stream_writer(self, write_stream) -> JsonRpcStreamWriter:
+        # The pick/highlight results may be big, so, use a faster encoder
+        # for those if available.
+        return JsonRpcStreamWriter(write_stream, encode=create_fast_json_encoder())
+
     @property
     def _web_inspector_thread(self):
         # Lazily-initialize
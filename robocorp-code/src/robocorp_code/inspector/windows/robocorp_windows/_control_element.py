@@ -496,6 +496,7 @@ class ControlElement:
         timeout: Optional[float] = None,
         search_strategy: Literal["siblings", "all"] = "siblings",
         wait_for_element=False,
+        max_matches: Optional[int] = None,
     ) -> List["ControlElement"]:
         """
         This method may be used to find multiple descendants of the current
@@ -531,6 +532,9 @@ class ControlElement:
                 until an element with the given locator is found (note that if True
                 and no element was found an ElementNotFound is raised).
 
+            max_matches: If given, the search is stopped after the given number
+                of elements is found.
+
         Note:
             Keep in mind that by default the search strategy is for searching
             `siblings` of the initial element found (so, by default, after the first
@@ -549,6 +553,7 @@ class ControlElement:
                 timeout=timeout,
                 search_strategy=search_strategy,
                 wait_for_element=wait_for_element,
+                max_matches=max_matches,
             )
         ]
 
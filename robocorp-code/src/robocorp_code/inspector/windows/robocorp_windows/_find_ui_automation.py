@@ -1,12 +1,25 @@
+import functools
+import itertools
 import re
 import time
 from dataclasses import dataclass
 from re import Pattern
-from typing import Dict, Iterator, List, Literal, Optional, Protocol, Set, Tuple, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    Union,
+)
 
 from ._com_error import COMError
 from ._errors import ElementNotFound
-from ._iter_tree import ControlTreeNode
+from ._iter_tree import ControlTreeNode, get_cached_attr, get_children_build_cache
 from ._match_ast import OrSearchParams, SearchParams
 from ._match_common import SearchType
 from ._ui_automation_wrapper import _UIAutomationControlWrapper
@@ -67,11 +80,11 @@ class ICompareFunc(Protocol):
 def _cmp_subname(el: ControlTreeNode["Control"], search_value) -> bool:
     if not isinstance(search_value, str):
         return False
-    return search_value in el.control.Name
+    return search_value in get_cached_attr(el.control, "Name")
 
 
 def _cmp_regex(el: ControlTreeNode["Control"], search_value) -> bool:
-    return bool(re.match(search_value, el.control.Name))
+    return bool(re.match(search_value, get_cached_attr(el.control, "Name")))
 
 
 def _cmp_depth(el: ControlTreeNode["Control"], search_value) -> bool:
@@ -116,22 +129,76 @@ _match_dispatch: Dict[Union[str, Pattern[str]], Union[str, ICompareFunc]] = {
 }
 
 
-def _matches(search_params: SearchType, tree_node: ControlTreeNode["Control"]):
+def _cmp_compiled_regex(el: ControlTreeNode["Control"], search_value) -> bool:
+    return bool(search_value.match(get_cached_attr(el.control, "Name")))
+
+
+@functools.lru_cache
+def _get_control_type_name_to_id() -> Dict[str, int]:
+    from ._vendored.uiautomation.uiautomation import ControlTypeNames
+
+    return {name: control_type_id for control_type_id, name in ControlTypeNames.items()}
+
+
+def _never_matches(tree_node: ControlTreeNode["Control"]) -> bool:
+    return False
+
+
+def compile_search_params(
+    search_params: SearchType,
+) -> Callable[[ControlTreeNode["Control"]], bool]:
+    """
+    Resolves the comparisons needed for the given search params once (so that
+    checking many nodes against the same search params doesn't need to redo it
+    for each node).
+
+    Returns:
+        A callable which checks whether a tree node matches the search params.
+    """
     if not search_params:
-        return False
+        return _never_matches
+
+    attr_checks: List[Tuple[str, object]] = []
+    func_checks: List[Tuple[ICompareFunc, object]] = []
+    for search_key, search_val in search_params.items():
+        comp_func_or_attr = _match_dispatch[search_key]
+        if isinstance(comp_func_or_attr, str):
+            if comp_func_or_attr == "ControlTypeName":
+                # Compare the control type id directly (instead of converting
+                # the control type of each node to its name).
+                control_type_id = _get_control_type_name_to_id().get(search_val)
+                if control_type_id is not None:
+                    attr_checks.append(("ControlType", control_type_id))
+                    continue
+            attr_checks.append((comp_func_or_attr, search_val))
+        elif comp_func_or_attr is _cmp_regex:
+            func_checks.append((_cmp_compiled_regex, re.compile(search_val)))
+        else:
+            func_checks.append((comp_func_or_attr, search_val))
 
-    try:
-        for search_key, search_val in search_params.items():
-            comp_func_or_attr = _match_dispatch[search_key]
-            if isinstance(comp_func_or_attr, str):
-                if getattr(tree_node.control, comp_func_or_attr) != search_val:
+    # The attributes are checked first as they're cheaper (usually
+    # available in the cache) than the comparison functions.
+    attr_checks_tup = tuple(attr_checks)
+    func_checks_tup = tuple(func_checks)
+
+    def matches(tree_node: ControlTreeNode["Control"]) -> bool:
+        control = tree_node.control
+        try:
+            for attr, search_val in attr_checks_tup:
+                if get_cached_attr(control, attr) != search_val:
                     return False
-            elif not comp_func_or_attr(tree_node, search_val):
-                return False
-    except COMError:
-        return False
+            for comp_func, search_val in func_checks_tup:
+                if not comp_func(tree_node, search_val):
+                    return False
+        except COMError:
+            return False
+        return True
+
+    return matches
 
-    return True
+
+def _matches(search_params: SearchType, tree_node: ControlTreeNode["Control"]):
+    return compile_search_params(search_params)(tree_node)
 
 
 def _get_control_from_path(
@@ -142,7 +209,7 @@ def _get_control_from_path(
     current = root_control
 
     for index, position in enumerate(path):
-        children = current.GetChildren()
+        children = get_children_build_cache(current)
         if position > len(children):
             partial_path = "|".join(str(pos) for pos in path[:index])
 
@@ -273,6 +340,17 @@ def _find_ui_automation_wrappers(
                 return
 
 
+def _is_inspector_window(tree_node: ControlTreeNode["Control"]) -> bool:
+    # The windows created by the inspector to highlight elements are
+    # top-level windows which never contain what the user is searching for.
+    if tree_node.depth != 1:
+        return False
+    try:
+        return get_cached_attr(tree_node.control, "Name") == "Inspect picker root"
+    except COMError:
+        return False
+
+
 def _search_step(
     locator: str,
     root_control,
@@ -360,14 +438,25 @@ def _search_step(
 
     from ._iter_tree import iter_tree
 
+    # Compile the search params once for all the nodes checked.
+    compiled_search_params = [
+        (compile_search_params(search_params), search_params)
+        for search_params in keep_searching
+    ]
+
     found = False
-    for el in iter_tree(root_control, max_depth=search_depth, only_depths=only_depths):
+    for el in iter_tree(
+        root_control,
+        max_depth=search_depth,
+        only_depths=only_depths,
+        skip_children=_is_inspector_window,
+    ):
         if not found:
             # If we found one item, we cannot time-out anymore.
             if timeout_monitor and timeout_monitor.timed_out():
                 return
-        for search_params in keep_searching:
-            if _matches(search_params, el):
+        for matches, search_params in compiled_search_params:
+            if matches(el):
                 found = True
                 yield (el, search_params)
 
@@ -384,6 +473,7 @@ def _search_siblings(
     child_pos = root_control_tree_node.child_pos
     parent_path = "|".join(root_control_tree_node.path.split("|")[:-1])
 
+    matches = compile_search_params(search_params)
     while True:
         next_control = root_control.GetNextSiblingControl()
         if not next_control:
@@ -391,7 +481,7 @@ def _search_siblings(
 
         child_pos += 1
 
-        if _matches(search_params, ControlTreeNode(next_control, 0, 0, "")):
+        if matches(ControlTreeNode(next_control, 0, 0, "")):
             path = f"{parent_path}|{child_pos}"
 
             location_info = LocationInfo(locator, depth, child_pos, path)
@@ -449,6 +539,7 @@ def find_ui_automation_wrappers(
     search_strategy: Literal["siblings", "all"] = "siblings",
     wait_for_element: bool = False,
     timeout_monitor: Optional["TimeoutMonitor"] = None,
+    max_matches: Optional[int] = None,
 ) -> List[_UIAutomationControlWrapper]:
     """Get a list of elements matching the locator.
 
@@ -474,6 +565,8 @@ def find_ui_automation_wrappers(
             TimeoutMonitor passed instead (meaning that it may timeout even
             before a single full search is done). It's used even if wait_for_element
             is False.
+        max_matches: If given, the search is stopped as soon as the given
+            number of elements is found.
     """
     if wait_for_element:
         from . import config
@@ -493,13 +586,18 @@ def find_ui_automation_wrappers(
     while True:
         # At least one search is always done (although it may time-out if
         # the timeout_monitor was passed).
+        # Note: the search is lazy, so, when max_matches is given the tree
+        # traversal stops as soon as that number of elements is found.
         ret = list(
-            _find_ui_automation_wrappers(
-                locator,
-                search_depth,
-                root_element,
-                search_strategy=search_strategy,
-                timeout_monitor=timeout_monitor,
+            itertools.islice(
+                _find_ui_automation_wrappers(
+                    locator,
+                    search_depth,
+                    root_element,
+                    search_strategy=search_strategy,
+                    timeout_monitor=timeout_monitor,
+                ),
+                max_matches,
             )
         )
         if not wait_for_element or len(ret) > 0:
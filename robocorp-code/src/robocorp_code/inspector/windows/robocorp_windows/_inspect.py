@@ -42,24 +42,6 @@ DEBUG = False
 MAX_ELEMENTS_TO_HIGHLIGHT = 20
 
 
-class _BoundsIndex:
-    def __init__(self):
-        self._bounds_and_obj = []
-
-    def insert(self, bounds_rect, obj: "ControlTreeNode[ControlElement]"):
-        """
-        Args:
-            bounds_rect: (left, top, right, bottom)
-        """
-        self._bounds_and_obj.append((bounds_rect, obj))
-
-    def intersect(self, x, y) -> Iterator["ControlTreeNode[ControlElement]"]:
-        for bounds_rect, obj in self._bounds_and_obj:
-            left, top, right, bottom = bounds_rect
-            if left <= x <= right and top <= y <= bottom:
-                yield obj
-
-
 def request_action(queue):
     while True:
         user_entered = input(
@@ -628,29 +610,32 @@ class _PickerThread(threading.Thread):
         if visited_handles is None:
             visited_handles = set()
 
-        left = parent.left
-        top = parent.top
-        x_in_parent = cursor[0] - left
-        y_in_parent = cursor[1] - top
-        try:
-            children = parent._wrapped.item.GetChildren()
+        # Note: iterative (instead of recursing for each level) so that deep
+        # trees don't hit the recursion limit.
+        while True:
+            left = parent.left
+            top = parent.top
+            x_in_parent = cursor[0] - left
+            y_in_parent = cursor[1] - top
+            try:
+                children = parent._wrapped.item.GetChildren()
+
+                # XXX is the parent.handle the proper handle to pass?
+                control = uiautomation.ControlFromPointInParent(
+                    parent.handle, x_in_parent, y_in_parent
+                )
+                if control is None or ControlsAreSame(control, parent._wrapped.item):
+                    return
+                for child_pos, c in enumerate(children):
+                    if ControlsAreSame(c, control):
+                        child_pos += 1
+                        break
+                else:
+                    print(f"Unable to find child index for: {control}", file=sys.stderr)
+                    return
+            except COMError:
+                return  # Ignore, if the user is out of bounds it'll be raised.
 
-            # XXX is the parent.handle the proper handle to pass?
-            control = uiautomation.ControlFromPointInParent(
-                parent.handle, x_in_parent, y_in_parent
-            )
-            if control is None or ControlsAreSame(control, parent._wrapped.item):
-                return
-            for child_pos, c in enumerate(children):
-                if ControlsAreSame(c, control):
-                    child_pos += 1
-                    break
-            else:
-                print(f"Unable to find child index for: {control}", file=sys.stderr)
-                return
-        except COMError:
-            pass  # Ignore, if the user is out of bounds it'll be raised.
-        else:
             if not parent_path:
                 path = f"{child_pos}"
             else:
@@ -664,9 +649,8 @@ class _PickerThread(threading.Thread):
             )
 
             yield el
-            yield from self._found_from_cursor_pos_with_point_in_parent(
-                el.control, cursor, visited_handles, depth, path
-            )
+            parent = el.control
+            parent_path = path
 
     def _do_pick(
         self, cursor_pos: CursorPos
@@ -674,6 +658,8 @@ class _PickerThread(threading.Thread):
         """
         Returns the elements found in the given cursor position.
         """
+        from ._vendored.uiautomation.uiautomation import GetCursorPos
+
         ev = self._tk_handler_thread.set_rects([])
         ev.wait(0.1)
 
@@ -709,7 +695,14 @@ class _PickerThread(threading.Thread):
                 # meanwhile, this didn't work.
                 if time.monotonic() > timeout_at:
                     return None
-                time.sleep(0.1)
+                if self._stop_event.wait(0.1):
+                    # Stopped while waiting to retry.
+                    return None
+                if not cursor_pos.consider_same_as(CursorPos(*GetCursorPos())):
+                    # The cursor moved in the meanwhile: don't keep on trying
+                    # to resolve an old position (the new position will be
+                    # resolved once the cursor stops).
+                    return None
             except (
                 PickedElementNotInParentHierarchy,
                 UnreachableElementInParentHierarchy,
@@ -726,6 +719,7 @@ class _PickerThread(threading.Thread):
 
     def _run(self) -> None:
         from ._vendored.uiautomation.uiautomation import (
+            ControlsAreSame,
             GetCursorPos,
             UIAutomationInitializerInThread,
         )
@@ -735,6 +729,7 @@ class _PickerThread(threading.Thread):
             last_cursor_pos = CursorPos(*GetCursorPos())
             cursor_time = time.monotonic()
             last_pick_pos = None
+            last_picked: Optional["ControlTreeNode[ControlElement]"] = None
 
             while True:
                 if self._stop_event.wait(0.13):
@@ -768,7 +763,20 @@ class _PickerThread(threading.Thread):
                 last_pick_pos = last_cursor_pos
 
                 if found and not self._stop_event.is_set():
-                    self.on_pick(found)
+                    picked = found[-1]
+                    # Only notify if the picked element actually changed (the
+                    # path alone is not enough as the window may have been
+                    # re-layout and a different element may be at the same path).
+                    if (
+                        last_picked is None
+                        or picked.path != last_picked.path
+                        or not ControlsAreSame(
+                            picked.control._wrapped.item,
+                            last_picked.control._wrapped.item,
+                        )
+                    ):
+                        last_picked = picked
+                        self.on_pick(found)
                     # If we haven't found we don't even need to remove the
                     # rects as the picker itself did that.
                     new_rects = [f.control.rectangle for f in found[-1:]]
@@ -836,10 +844,19 @@ class _CursorListenerThread(threading.Thread):
 
 
 class ElementInspector:
+    # The matches found for a locator may be reused by the next search with
+    # the same parameters if done during this time (in seconds) so that the same
+    # search done in sequence (i.e.: collect the tree and then highlight it)
+    # doesn't need to traverse the UIA tree again.
+    MATCHES_CACHE_TIMEOUT = 1.0
+
     def __init__(self, control_element: ControlElement):
         self.control_element = control_element
         self._picker_thread: Optional[_PickerThread] = None
         self._cursor_thread: Optional[_CursorListenerThread] = None
+        self._matches_cache: Optional[
+            Tuple[tuple, float, Sequence[ControlElement]]
+        ] = None
 
         self._tk_handler_thread: _TkHandlerThread = _TkHandlerThread()
         self._tk_handler_thread.start()
@@ -860,14 +877,62 @@ class ElementInspector:
 
     def dispose(self):
         self._check_thread()
+        self._matches_cache = None
         self._tk_handler_thread.dispose()
 
+    def invalidate_matches_cache(self) -> None:
+        self._matches_cache = None
+
+    def find_many(
+        self,
+        locator: Locator,
+        search_depth: int = 8,
+        timeout: Optional[float] = None,
+        search_strategy: Literal["siblings", "all"] = "all",
+        max_matches: Optional[int] = None,
+    ) -> Sequence[ControlElement]:
+        """
+        Finds the elements matching the given locator (without waiting for
+        them).
+
+        The result of a search is reused (only once) by the next search with the
+        same parameters if it's done in up to `MATCHES_CACHE_TIMEOUT` seconds
+        and none of the matches was disposed in the meanwhile. Stopping the
+        highlight or starting a pick invalidates it.
+
+        Raises:
+            ElementNotFound: if some part of the locator could not be resolved.
+        """
+        key = (locator, search_depth, search_strategy, max_matches)
+        cached = self._matches_cache
+        self._matches_cache = None
+        if cached is not None:
+            cached_key, cached_at, cached_matches = cached
+            if (
+                cached_key == key
+                and time.monotonic() - cached_at < self.MATCHES_CACHE_TIMEOUT
+                and not any(m.is_disposed() for m in cached_matches)
+            ):
+                return cached_matches
+
+        matches = self.control_element.find_many(
+            locator,
+            search_depth,
+            timeout,
+            search_strategy=search_strategy,
+            wait_for_element=False,
+            max_matches=max_matches,
+        )
+        self._matches_cache = (key, time.monotonic(), matches)
+        return matches
+
     def start_highlight(
         self,
         locator: Optional[Locator] = None,
         search_depth: int = 8,
         timeout: Optional[float] = None,
         search_strategy: Literal["siblings", "all"] = "all",
+        max_matches: Optional[int] = None,
     ) -> Sequence["ControlElement"]:
         """
         Args:
@@ -876,6 +941,8 @@ class ElementInspector:
             timeout: Timeout to find a locator.
             search_strategy: After finding a locator, should only siblings be found
               or should a full tree traversal be done?
+            max_matches: If given, the search stops after the given number of
+              matches is found.
 
         Returns:
             The elements found which matched the given locator.
@@ -899,12 +966,12 @@ class ElementInspector:
 
         matches: Sequence[ControlElement]
         try:
-            matches = self.control_element.find_many(
+            matches = self.find_many(
                 locator,
                 search_depth,
                 timeout,
-                search_strategy,
-                wait_for_element=False,
+                search_strategy=search_strategy,
+                max_matches=max_matches,
             )
         except ElementNotFound:
             matches = ()
@@ -933,6 +1000,7 @@ class ElementInspector:
 
     def stop_highlight(self) -> None:
         self._check_thread()
+        self.invalidate_matches_cache()
         self._tk_handler_thread.quitloop()
         self._tk_handler_thread.destroy_tk_handler()
         if self._cursor_thread:
@@ -962,6 +1030,7 @@ class ElementInspector:
     def start_picking(self, on_pick):
         self._check_thread()
         assert self._picker_thread is None, "Error. A picking is already in place."
+        self.invalidate_matches_cache()
 
         self.start_highlight()
 
@@ -1,5 +1,16 @@
 import typing
-from typing import Generic, Iterator, Optional, Set, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from ._com_error import COMError
 
@@ -9,6 +20,122 @@ if typing.TYPE_CHECKING:
 T = TypeVar("T")
 Y = TypeVar("Y", covariant=True)
 
+# TreeScope_Children (from UIAutomationClient.h).
+_TREE_SCOPE_CHILDREN = 2
+
+
+class _CacheRequestHolder:
+    _cache_request: Any = None
+
+
+def _get_cache_request() -> Any:
+    """
+    Provides the IUIAutomationCacheRequest used to prefetch the properties
+    which are used when searching/matching elements (so that they're fetched
+    along with the children in a single cross-process call instead of one
+    call per property per element).
+    """
+    cache_request = _CacheRequestHolder._cache_request
+    if cache_request is None:
+        from ._vendored.uiautomation.uiautomation import (
+            PropertyId,
+            _AutomationClient,
+        )
+
+        cache_request = _AutomationClient.instance().IUIAutomation.CreateCacheRequest()
+        for property_id in (
+            PropertyId.NameProperty,
+            PropertyId.ClassNameProperty,
+            PropertyId.AutomationIdProperty,
+            PropertyId.ControlTypeProperty,
+            PropertyId.BoundingRectangleProperty,
+            PropertyId.NativeWindowHandleProperty,
+            PropertyId.ProcessIdProperty,
+        ):
+            cache_request.AddProperty(property_id)
+        # Note: the AutomationElementMode is kept as Full (the default) because
+        # the elements are still used afterwards to get to their children/parent.
+        _CacheRequestHolder._cache_request = cache_request
+    return cache_request
+
+
+def _cached_control_type_name(element) -> str:
+    from ._vendored.uiautomation.uiautomation import ControlTypeNames
+
+    return ControlTypeNames[element.CachedControlType]
+
+
+def _cached_bounding_rectangle(element):
+    from ._vendored.uiautomation.uiautomation import Rect
+
+    rect = element.CachedBoundingRectangle
+    return Rect(rect.left, rect.top, rect.right, rect.bottom)
+
+
+# Maps the attribute name in the uiautomation.Control to a function which
+# gets the same information from the cache in the IUIAutomationElement.
+_ATTR_TO_CACHED_GETTER: Dict[str, Callable[[Any], Any]] = {
+    "Name": lambda element: element.CachedName or "",
+    "AutomationId": lambda element: element.CachedAutomationId,
+    "ClassName": lambda element: element.CachedClassName,
+    "ControlType": lambda element: element.CachedControlType,
+    "ControlTypeName": _cached_control_type_name,
+    "BoundingRectangle": _cached_bounding_rectangle,
+    "NativeWindowHandle": lambda element: element.CachedNativeWindowHandle or 0,
+    "ProcessId": lambda element: element.CachedProcessId,
+}
+
+
+def get_cached_attr(ctrl: "Control", attr_name: str) -> Any:
+    """
+    Provides the given attribute of the control (i.e.: "Name", "ClassName"),
+    reading it from the UIA cache if available (the cache is available for
+    controls gotten from `get_children_build_cache`).
+
+    If it's not in the cache the attribute is gotten directly
+    from the control (which requires a cross-process call).
+    """
+    cached_getter = _ATTR_TO_CACHED_GETTER.get(attr_name)
+    if cached_getter is not None:
+        try:
+            return cached_getter(ctrl.Element)
+        except COMError:
+            pass  # Not cached: get it from the control.
+    return getattr(ctrl, attr_name)
+
+
+def get_children_build_cache(ctrl: "Control") -> List["Control"]:
+    """
+    Provides the children of the given control (in the raw view, so, this
+    is the same as `ctrl.GetChildren()`) but gets all the children in
+    a single call with their properties already cached.
+    """
+    from ._vendored.uiautomation.uiautomation import (
+        ControlConstructors,
+        _AutomationClient,
+    )
+
+    try:
+        element_array = ctrl.Element.FindAllBuildCache(
+            _TREE_SCOPE_CHILDREN,
+            _AutomationClient.instance().IUIAutomation.RawViewCondition,
+            _get_cache_request(),
+        )
+    except COMError:
+        # Fallback to the tree walker if FindAllBuildCache fails for some reason.
+        return ctrl.GetChildren()
+
+    children: List["Control"] = []
+    if not element_array:
+        return children
+
+    for i in range(element_array.Length):
+        element = element_array.GetElement(i)
+        constructor = ControlConstructors.get(element.CachedControlType)
+        if constructor is not None:
+            children.append(constructor(element=element))
+    return children
+
 
 class ControlTreeNode(Generic[Y]):
     """
@@ -48,6 +175,8 @@ def iter_tree(
     root_ctrl: "Control",
     max_depth: int = 8,
     only_depths: Optional[Set[int]] = None,
+    min_depth: int = 1,
+    skip_children: Optional[Callable[[ControlTreeNode["Control"]], bool]] = None,
 ) -> Iterator[ControlTreeNode["Control"]]:
     """
     Iterates the tree as a flattened iterator (the depth is available in the node).
@@ -62,12 +191,22 @@ def iter_tree(
             If given, only elements at the given depths will be returned
             (1-based indexes)
 
+        min_depth:
+            Elements at depths lower than this one are still traversed but
+            are not returned (1-based index).
+
+        skip_children:
+            If given, it's called for each node and if it returns True the
+            children of that node are not traversed (the node itself is still
+            returned).
+
     To get a nice representation it's possible to do something as:
         for control_node in iter_tree(...):
             print(control_node)
     """
     if only_depths is not None:
         max_depth = max(only_depths)
+        min_depth = max(min_depth, min(only_depths))
 
     # This code could be used to do a breadth first search (by default
     # we do a depth first search).
@@ -115,58 +254,45 @@ def iter_tree(
     # Algorithm to do a depth-first search without recursion. This is the
     # default because it's how we want to present the tree to the user when we
     # print it.
-    depth = 0
+    # Each stack entry has an iterator over the (1-based) children still to be
+    # visited at that level along with the path of their parent, so, children
+    # are only requested when their parent is actually reached.
     try:
-        children = root_ctrl.GetChildren()
+        children = get_children_build_cache(root_ctrl)
     except COMError:
         return
 
-    child_list = [(_ContainerView(children), "", len(children))]
+    stack: List[Tuple[Iterator[Tuple[int, "Control"]], str]] = [
+        (enumerate(children, 1), "")
+    ]
 
-    while depth >= 0:
-        last_items, parent_path, children_len = child_list[-1]
-        if last_items:
-            child_pos = children_len - len(last_items) + 1
-            if parent_path:
-                use_path = f"{parent_path}|{child_pos}"
-            else:
-                use_path = f"{child_pos}"
-            curr = last_items.popleft()
-            node = ControlTreeNode(curr, depth + 1, child_pos, use_path)
+    while stack:
+        children_it, parent_path = stack[-1]
+        next_child = next(children_it, None)
+        if next_child is None:
+            stack.pop()
+            continue
+
+        child_pos, curr = next_child
+        if parent_path:
+            use_path = f"{parent_path}|{child_pos}"
+        else:
+            use_path = f"{child_pos}"
+
+        node_depth = len(stack)
+        node = ControlTreeNode(curr, node_depth, child_pos, use_path)
+        if node_depth >= min_depth:
             if only_depths is None:
                 yield node
-            elif (depth + 1) in only_depths:
+            elif node_depth in only_depths:
                 yield node
-            if depth + 1 < max_depth:
-                try:
-                    children = curr.GetChildren()
-                except COMError:
-                    pass
-                else:
-                    if children:
-                        depth += 1
-                        child_list.append(
-                            (_ContainerView(children), use_path, len(children))
-                        )
-        else:
-            del child_list[depth]
-            depth -= 1
-
-
-class _ContainerView:
-    # A bit of an optimization: because lists in python are actually arrays
-    # removing from position 0 can be slow, so, we create a container view
-    # which will not really remove it, instead it'll just increment the
-    # first visible position. Better than a deque because we'd need to create
-    # it from the list which can be slow.
-
-    def __init__(self, lst):
-        self.first = 0
-        self._lst = lst
-
-    def popleft(self):
-        self.first += 1
-        return self._lst[self.first - 1]
-
-    def __len__(self):
-        return len(self._lst) - self.first
+        if node_depth < max_depth:
+            if skip_children is not None and skip_children(node):
+                continue
+            try:
+                children = get_children_build_cache(curr)
+            except COMError:
+                pass
+            else:
+                if children:
+                    stack.append((enumerate(children, 1), use_path))
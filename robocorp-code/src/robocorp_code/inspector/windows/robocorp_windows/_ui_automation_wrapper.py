@@ -10,7 +10,7 @@ if typing.TYPE_CHECKING:
     from ._vendored.uiautomation.uiautomation import Control
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationInfo:
     query_locator: Optional[Locator]
     depth: Optional[int]
@@ -80,28 +80,36 @@ class _UIAutomationControlWrapper:
             location_info:
                 This
         """
+        from ._iter_tree import get_cached_attr
+
         self.item: "Control" = item
         self.location_info = location_info
         try:
-            self.name = item.Name
+            self.name = get_cached_attr(item, "Name")
         except COMError:
             self.name = "<disposed>"
 
         try:
-            self.automation_id = item.AutomationId
+            self.automation_id = get_cached_attr(item, "AutomationId")
         except COMError:
             self.automation_id = "<disposed>"
 
         try:
-            self.control_type = item.ControlTypeName
+            self.control_type = get_cached_attr(item, "ControlTypeName")
         except COMError:
             self.control_type = "<disposed>"
         try:
-            self.class_name = item.ClassName
+            self.class_name = get_cached_attr(item, "ClassName")
         except COMError:
             self.class_name = "<disposed>"
 
-        self.update_geometry()
+        # Note: the initial geometry may come from the cache (update_geometry()
+        # always gets the current geometry).
+        try:
+            rect = get_cached_attr(item, "BoundingRectangle")
+        except COMError:
+            rect = None
+        self._set_geometry(rect)
 
     def get_parent(self) -> Optional["_UIAutomationControlWrapper"]:
         parent = self.item.GetParentControl()
@@ -125,26 +133,33 @@ class _UIAutomationControlWrapper:
 
     @property
     def handle(self) -> int:
+        from ._iter_tree import get_cached_attr
+
         try:
             return self.__handle
         except AttributeError:
-            self.__handle = self.item.NativeWindowHandle
+            self.__handle = get_cached_attr(self.item, "NativeWindowHandle")
         return self.__handle
 
     @property
     def pid(self) -> int:
+        from ._iter_tree import get_cached_attr
+
         try:
             return self.__pid
         except AttributeError:
-            self.__pid = self.item.ProcessId
+            self.__pid = get_cached_attr(self.item, "ProcessId")
         return self.__pid
 
     def update_geometry(self):
-        # If there's no rectangle, then all coords are defaulting to -1.
         try:
             rect = self.item.BoundingRectangle
         except COMError:
             rect = None
+        self._set_geometry(rect)
+
+    def _set_geometry(self, rect):
+        # If there's no rectangle, then all coords are defaulting to -1.
         if rect:
             self.left = rect.left
             self.right = rect.right
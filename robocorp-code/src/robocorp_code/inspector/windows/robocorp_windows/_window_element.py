@@ -1,6 +1,6 @@
 import logging
 import typing
-from typing import Any, Optional, Union
+from typing import Any, List, Optional, Sequence, Union
 
 import psutil
 
@@ -26,6 +26,52 @@ class _ExecutableNotSetSentinel:
     pass
 
 
+def _get_executable_from_pid(pid: int) -> Optional[str]:
+    try:
+        from psutil import Process
+
+        proc = Process(pid)
+        return proc.exe()
+    except Exception:
+        return None
+
+
+def prefetch_executables(
+    windows: Sequence["WindowElement"], max_workers: int = 8
+) -> None:
+    """
+    Fills the executable of each of the given windows (querying the executable
+    of each process in parallel).
+
+    Note: only the process information is queried in the worker threads, the
+    pid (which requires UIA) is still obtained in the current thread.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    pending: List["WindowElement"] = []
+    pids: List[int] = []
+    for w in windows:
+        if isinstance(w._executable, _ExecutableNotSetSentinel):
+            try:
+                pid = w.pid
+            except Exception:
+                w._executable = None
+                continue
+            pending.append(w)
+            pids.append(pid)
+
+    if not pending:
+        return
+
+    if len(pending) == 1:
+        pending[0]._executable = _get_executable_from_pid(pids[0])
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        for w, executable in zip(pending, executor.map(_get_executable_from_pid, pids)):
+            w._executable = executable
+
+
 class WindowElement(ControlElement):
     """
     Class used to interact with a window.
@@ -110,15 +156,12 @@ class WindowElement(ControlElement):
             not possible to get it).
         """
         if isinstance(self._executable, _ExecutableNotSetSentinel):
-            executable: Optional[str] = None
             try:
-                from psutil import Process
-
-                proc = Process(self.pid)
-                executable = proc.exe()
-                self._executable = executable
+                pid = self.pid
             except Exception:
                 self._executable = None
+            else:
+                self._executable = _get_executable_from_pid(pid)
         return self._executable
 
     def find_child_window(
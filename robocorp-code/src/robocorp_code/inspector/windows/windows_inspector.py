@@ -1,8 +1,11 @@
 import enum
+import threading
 import typing
+from collections import deque
 from typing import (
     Any,
     Callable,
+    Deque,
     List,
     Literal,
     Optional,
@@ -12,7 +15,6 @@ from typing import (
     Union,
 )
 
-from robocorp_ls_core.callbacks import Callback
 from robocorp_ls_core.robotframework_log import get_logger
 
 log = get_logger(__name__)
@@ -142,6 +144,113 @@ class IOnPickCallback(typing.Protocol):
         pass
 
 
+class _OnPickCallback:
+    """
+    Implementation of `IOnPickCallback` optimized for the usual case where
+    there's a single listener.
+
+    Note that it's thread safe to register/unregister callbacks while callbacks
+    are being notified, but it's not thread-safe to register/unregister at the
+    same time in multiple threads.
+    """
+
+    def __init__(self) -> None:
+        self._single: Optional[
+            Callable[[List[ControlLocatorInfoTypedDict]], Any]
+        ] = None
+        self._extra: List[Callable[[List[ControlLocatorInfoTypedDict]], Any]] = []
+
+    def register(
+        self, callback: Callable[[List[ControlLocatorInfoTypedDict]], Any]
+    ) -> None:
+        if self._single is None:
+            self._single = callback
+        else:
+            self._extra = self._extra + [callback]
+
+    def unregister(
+        self, callback: Callable[[List[ControlLocatorInfoTypedDict]], Any]
+    ) -> None:
+        remaining = [x for x in self._extra if x != callback]
+        if self._single == callback:
+            promoted = remaining.pop(0) if remaining else None
+            # Update `_extra` first so that a concurrent notification never
+            # sees the promoted callback in both places.
+            self._extra = remaining
+            self._single = promoted
+        else:
+            self._extra = remaining
+
+    def __call__(self, locator_info_tree: List[ControlLocatorInfoTypedDict]):
+        callback = self._single
+        if callback is None:
+            return
+        try:
+            callback(locator_info_tree)
+        except Exception:
+            log.exception("Error in on_pick callback.")
+
+        for callback in self._extra:
+            try:
+                callback(locator_info_tree)
+            except Exception:
+                log.exception("Error in on_pick callback.")
+
+    def __len__(self) -> int:
+        if self._single is None:
+            return 0
+        return 1 + len(self._extra)
+
+
+class _PickDispatcherThread(threading.Thread):
+    """
+    Calls the `on_pick` callbacks in a separate thread so that slow listeners
+    don't stall the thread which is doing the picking (UIA).
+    """
+
+    # If the listeners can't keep up, the oldest picks are dropped.
+    MAX_PENDING = 8
+
+    def __init__(self, on_pick: IOnPickCallback) -> None:
+        threading.Thread.__init__(self, name="PickDispatcherThread")
+        self.daemon = True
+
+        self._on_pick = on_pick
+        self._pending: Deque[List[ControlLocatorInfoTypedDict]] = deque(
+            maxlen=self.MAX_PENDING
+        )
+        self._event = threading.Event()
+        self._disposed = False
+
+    def put(self, picked: List[ControlLocatorInfoTypedDict]) -> None:
+        self._pending.append(picked)
+        self._event.set()
+
+    def run(self) -> None:
+        while True:
+            self._event.wait()
+            self._event.clear()
+            while True:
+                try:
+                    picked = self._pending.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._on_pick(picked)
+                except Exception:
+                    log.exception("Error calling on_pick.")
+
+            if self._disposed:
+                return
+
+    def dispose(self) -> None:
+        """
+        Stops the thread (after the pending picks are dispatched).
+        """
+        self._disposed = True
+        self._event.set()
+
+
 class _State(enum.Enum):
     default = 1
     picking = 2
@@ -180,14 +289,18 @@ class WindowsInspector:
         )
 
         # Called as: self.on_pick([ControlLocatorInfoTypedDict])
-        self.on_pick: IOnPickCallback = Callback()
+        self.on_pick: IOnPickCallback = _OnPickCallback()
         self._element_inspector: Optional[ElementInspector] = None
         self._state = _State.default
+        self._pick_dispatcher_thread: Optional[_PickDispatcherThread] = None
 
     def dispose(self):
         if self._element_inspector is not None:
             self._element_inspector.dispose()
             self._element_inspector = None
+        if self._pick_dispatcher_thread is not None:
+            self._pick_dispatcher_thread.dispose()
+            self._pick_dispatcher_thread = None
         self._state = _State.default
 
     def set_window_locator(self, window_locator: str):
@@ -217,7 +330,9 @@ class WindowsInspector:
         converted: List[ControlLocatorInfoTypedDict] = []
         for node in found:
             converted.append(to_control_info(node.control))
-        self.on_pick(converted)
+        pick_dispatcher_thread = self._pick_dispatcher_thread
+        if pick_dispatcher_thread is not None:
+            pick_dispatcher_thread.put(converted)
 
     def reset_to_default_state(self):
         """
@@ -247,6 +362,8 @@ class WindowsInspector:
 
         self.reset_to_default_state()
         self._state = _State.picking
+        self._pick_dispatcher_thread = _PickDispatcherThread(self.on_pick)
+        self._pick_dispatcher_thread.start()
         self._element_inspector.start_picking(self._on_internal_pick)
 
     def stop_pick(self) -> None:
@@ -258,6 +375,9 @@ class WindowsInspector:
         if self._state == _State.picking:
             if self._element_inspector is not None:
                 self._element_inspector.stop_picking()
+            if self._pick_dispatcher_thread is not None:
+                self._pick_dispatcher_thread.dispose()
+                self._pick_dispatcher_thread = None
             self._state = _State.default
 
     def start_highlight(
@@ -265,12 +385,15 @@ class WindowsInspector:
         locator: str,
         search_depth: int = 8,
         search_strategy: Literal["siblings", "all"] = "all",
+        max_matches: Optional[int] = None,
     ) -> MatchesAndHierarchyTypedDict:
         """
         Starts highlighting the matches given by the locator specified.
 
         Args:
             locator: The locator whose matches should be highlighted.
+            max_matches: If given, the search stops after the given number
+                of matches is found.
 
         Returns:
             The matches found as a flattened list (the tree hierarchy
@@ -288,6 +411,7 @@ class WindowsInspector:
             search_depth=search_depth,
             timeout=0,
             search_strategy=search_strategy,
+            max_matches=max_matches,
         )
 
         parent = self._element_inspector.control_element
@@ -311,7 +435,14 @@ class WindowsInspector:
     def list_windows(self) -> List[WindowLocatorInfoTypedDict]:
         from robocorp_code.inspector.windows import robocorp_windows
 
+        from robocorp_code.inspector.windows.robocorp_windows._window_element import (
+            prefetch_executables,
+        )
+
         windows = robocorp_windows.find_windows("regex:.*", search_depth=1)
+        # The executable is the slowest info to get (and it's independent for
+        # each window), so, get it in parallel before converting.
+        prefetch_executables(windows)
         return [to_window_info(w) for w in windows]
 
     def collect_tree(
@@ -332,13 +463,13 @@ class WindowsInspector:
             search_strategy,
         )
 
-        matched_controls: List[
+        matched_controls: Sequence[
             "ControlElement"
-        ] = self._element_inspector.control_element.find_many(
+        ] = self._element_inspector.find_many(
             locator,
             search_depth=search_depth,
-            search_strategy=search_strategy,
             timeout=0,
+            search_strategy=search_strategy,
         )
         return to_matches_and_hierarchy(
             self._element_inspector.control_element, matched_controls
@@ -121,6 +121,33 @@ def test_conda_version_spec_api():
     assert not conda_version.VersionSpec("1.2").match("1.2.2")
 
 
+def test_conda_deps_add_after_lookup():
+    from robocorp_code.deps._conda_deps import CondaDeps
+
+    dep_range = {
+        "start": {"line": 0, "character": 0},
+        "end": {"line": 0, "character": 1},
+    }
+    conda_deps = CondaDeps()
+    conda_deps.add_dep("python=3.7", dep_range)
+    vspec = conda_deps.get_dep_vspec("python")
+    assert vspec is not None
+    assert vspec.match("3.7.1")
+    assert conda_deps.get_dep_vspec("pip") is None
+
+    # Deps added after a lookup must still resolve (and replace previous ones).
+    conda_deps.add_dep("pip=22", dep_range)
+    conda_deps.add_dep("python=3.9", dep_range)
+    vspec = conda_deps.get_dep_vspec("pip")
+    assert vspec is not None
+    assert vspec.match("22.1")
+    vspec = conda_deps.get_dep_vspec("python")
+    assert vspec is not None
+    assert vspec.match("3.9.2")
+    assert not vspec.match("3.7.1")
+    assert conda_deps.get_dep_range("pip") == dep_range
+
+
 def test_pypi_cloud(patch_pypi_cloud) -> None:
     from robocorp_code.deps.pypi_cloud import PyPiCloud
 
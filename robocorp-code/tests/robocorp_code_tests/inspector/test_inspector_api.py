@@ -243,3 +243,41 @@ def _manual_test_inspector_repl(
             cmd()
         else:
             print(f"Unrecognized input: {read}", file=sys.stderr)
+
+
+def test_inspector_api_fast_json_encoder():
+    import io
+    import json
+
+    pytest.importorskip("msgspec")
+
+    from robocorp_ls_core.jsonrpc.streams import JsonRpcStreamWriter
+
+    from robocorp_code.inspector.inspector_api import create_fast_json_encoder
+
+    encode = create_fast_json_encoder()
+    assert encode is not None
+
+    message = {
+        "jsonrpc": "2.0",
+        "method": "$/windowsPick",
+        "params": {
+            "picked": [
+                {"control": "ButtonControl", "name": "Ação á", "left": -10},
+                {"control": "EditControl", "name": "", "value": 1.5, "x": None},
+            ]
+        },
+    }
+
+    def decode(wfile):
+        header, body = wfile.getvalue().split(b"\r\n\r\n", 1)
+        assert header == b"Content-Length: %d" % (len(body),)
+        return json.loads(body.decode("utf-8"))
+
+    default_wfile = io.BytesIO()
+    JsonRpcStreamWriter(default_wfile).write(message)
+
+    fast_wfile = io.BytesIO()
+    JsonRpcStreamWriter(fast_wfile, encode=encode).write(message)
+
+    assert decode(fast_wfile) == decode(default_wfile) == message
@@ -67,3 +67,41 @@ def test_windows_inspector(windows_inspector: WindowsInspector) -> None:
     finally:
         # Stops picking and highlight.
         windows_inspector.reset_to_default_state()
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="Win32 only test.")
+def test_windows_inspector_matches_cache(windows_inspector: WindowsInspector) -> None:
+    windows_inspector.set_window_locator("name:Tkinter Elements Showcase")
+    element_inspector = windows_inspector._element_inspector
+    assert element_inspector is not None
+
+    try:
+        matches = element_inspector.find_many("control:Button")
+        assert len(matches) == 10
+
+        # The same search done right afterwards reuses the matches (only once).
+        assert element_inspector.find_many("control:Button") is matches
+        new_matches = element_inspector.find_many("control:Button")
+        assert new_matches is not matches
+
+        # Different parameters: searches again.
+        matches = new_matches
+        assert element_inspector.find_many("control:Button", search_depth=7) is not (
+            matches
+        )
+
+        # Expired: searches again.
+        matches = element_inspector.find_many("control:Button")
+        element_inspector.MATCHES_CACHE_TIMEOUT = 0
+        assert element_inspector.find_many("control:Button") is not matches
+        del element_inspector.MATCHES_CACHE_TIMEOUT
+
+        # Stopping the highlight invalidates it.
+        windows_inspector.start_highlight("control:Button")
+        matches = element_inspector.find_many("control:Button")
+        windows_inspector.stop_highlight()
+        new_matches = element_inspector.find_many("control:Button")
+        assert new_matches is not matches
+        assert len(new_matches) == 10
+    finally:
+        windows_inspector.reset_to_default_state()
@@ -16,7 +16,7 @@
 # limitations under the License.
 import threading
 from robocorp_ls_core.robotframework_log import get_logger
-from typing import Optional
+from typing import Optional, Callable, Any
 import json
 from robocorp_ls_core.options import BaseOptions
 import queue
@@ -194,11 +194,23 @@ class JsonRpcStreamReader(object):
 
 
 class JsonRpcStreamWriter(object):
-    def __init__(self, wfile, **json_dumps_args):
+    def __init__(
+        self,
+        wfile,
+        encode: Optional[Callable[[Any], bytes]] = None,
+        **json_dumps_args,
+    ):
+        """
+        :param encode:
+            A function which encodes a message to utf-8 bytes (may be used to
+            provide a faster encoder). If not given (or if it fails to encode
+            some message) `json.dumps(message, **json_dumps_args)` is used.
+        """
         assert wfile is not None
         self._wfile = wfile
         self._wfile_lock = threading.Lock()
         self._json_dumps_args = json_dumps_args
+        self._encode = encode
 
     def close(self):
         log.debug("Will close writer")
@@ -217,9 +229,20 @@ class JsonRpcStreamWriter(object):
                 else:
                     log.debug("Writing (non dict message): %s", message)
 
-                body = json.dumps(message, **self._json_dumps_args)
+                as_bytes = None
+                encode = self._encode
+                if encode is not None:
+                    try:
+                        as_bytes = encode(message)
+                    except Exception:
+                        # i.e.: Some type not supported in the given encoder:
+                        # fall back to the stdlib.
+                        pass
+
+                if as_bytes is None:
+                    body = json.dumps(message, **self._json_dumps_args)
+                    as_bytes = body.encode("utf-8")
 
-                as_bytes = body.encode("utf-8")
                 stream = self._wfile
                 content_len_as_str = "Content-Length: %s\r\n\r\n" % len(as_bytes)
                 content_len_bytes = content_len_as_str.encode("ascii")
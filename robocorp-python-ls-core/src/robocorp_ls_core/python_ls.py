@@ -459,12 +459,15 @@ class PythonLanguageServer(MethodDispatcher):
         self.watching_thread = None
 
         self._jsonrpc_stream_reader = JsonRpcStreamReader(read_stream)
-        self._jsonrpc_stream_writer = JsonRpcStreamWriter(write_stream)
+        self._jsonrpc_stream_writer = self._create_jsonrpc_stream_writer(write_stream)
         self._endpoint = Endpoint(self, self._jsonrpc_stream_writer.write)
         self._lsp_messages = LSPMessages(self._endpoint)
 
         self._shutdown = False
 
+    def _create_jsonrpc_stream_writer(self, write_stream) -> JsonRpcStreamWriter:
+        return JsonRpcStreamWriter(write_stream)
+
     def _create_lint_manager(self) -> Optional[BaseLintManager]:
         return None
 
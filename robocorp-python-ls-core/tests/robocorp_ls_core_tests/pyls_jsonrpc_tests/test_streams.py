@@ -105,3 +105,44 @@ def test_writer_bad_message(wfile, writer):
     )
 
     assert wfile.getvalue() in (b"", (b"Content-Length: 10\r\n" b"\r\n" b"1546304461"))
+
+
+def _decode_written(wfile):
+    import json
+
+    header, body = wfile.getvalue().split(b"\r\n\r\n", 1)
+    assert header == b"Content-Length: %d" % (len(body),)
+    return json.loads(body.decode("utf-8"))
+
+
+def test_writer_custom_encode():
+    import json
+
+    message = {
+        "id": "hello",
+        "method": "method",
+        "params": {"name": "áéíóú ção", "values": [1, 2.5, None, True]},
+    }
+
+    def encode(msg):
+        return json.dumps(msg, ensure_ascii=False).encode("utf-8")
+
+    default_wfile = BytesIO()
+    JsonRpcStreamWriter(default_wfile).write(message)
+
+    custom_wfile = BytesIO()
+    JsonRpcStreamWriter(custom_wfile, encode=encode).write(message)
+
+    assert custom_wfile.getvalue() != default_wfile.getvalue()
+    assert _decode_written(custom_wfile) == _decode_written(default_wfile) == message
+
+
+def test_writer_custom_encode_fallback():
+    message = {"id": "hello", "method": "method", "params": {}}
+
+    def encode(msg):
+        raise TypeError("Unable to encode")
+
+    wfile = BytesIO()
+    JsonRpcStreamWriter(wfile, encode=encode).write(message)
+    assert _decode_written(wfile) == message
@@ -29,6 +29,7 @@ from robotframework_debug_adapter.protocols import (
     IRobotBreakpoint,
     IBusyWait,
     IEvaluationInfo,
+    IEvaluationFuture,
 )
 from typing import Optional, List, Iterable, Union, Any, Dict, FrozenSet, Tuple
 from robocorp_ls_core.basic import implements
@@ -47,16 +48,46 @@ from robotframework_ls.impl.robot_constants import (
 )
 import time
 import sys
+import re
 
 _found_major_minor_version = None
 
+# Matches a plain variable (i.e.: ${var}, @{var}, &{var} or %{var}). The
+# group is the name used to get it from the variable store.
+_VARIABLE_RE = re.compile(r"^[\$@&%]\{([^{}]+)\}$")
+
+# Matches a plain assign in a keyword call (i.e.: ${var}, ${var}= or ${var} =).
+_ASSIGN_RE = re.compile(r"^[\$@&]\{[^{}\[\]]+\}( ?=)?$")
+
+# Statements which may appear in a test case but which are not keyword calls.
+_NON_KEYWORD_CALL_NAMES = frozenset(
+    (
+        "FOR",
+        "END",
+        "IF",
+        "ELSE IF",
+        "ELSE",
+        "WHILE",
+        "TRY",
+        "EXCEPT",
+        "FINALLY",
+        "RETURN",
+        "BREAK",
+        "CONTINUE",
+        "VAR",
+        "GROUP",
+    )
+)
+
+_GHERKIN_PREFIXES = ("given ", "when ", "then ", "and ", "but ")
+
 
 def _get_robot_naked_version():
     try:
         import robot  # noqa
 
         v = str(robot.get_version(True))
-    except:
+    except Exception:
         log.exception("Unable to get robot version.")
         v = "unknown"
     return v
@@ -79,7 +110,7 @@ def get_robot_major_minor_version() -> Tuple[int, int]:
                 major_version,
                 minor_version,
             )
-    except:
+    except Exception:
         log.exception("Unable to get robot major/minor version.")
 
     return major_minor_version
@@ -95,12 +126,42 @@ def get_builtin_normalized_names() -> FrozenSet[str]:
     return frozenset(normalized)
 
 
+@lru_cache(None)
+def _get_safe_repr():
+    # SafeRepr has no per-call state, so, a single instance is shared.
+    from robotframework_debug_adapter.safe_repr import SafeRepr
+
+    return SafeRepr()
+
+
 log = get_logger(__name__)
 
 next_id: INextId = partial(next, itertools.count(1))
 
+# The same few filenames are seen in every stack which is created.
+_basename = lru_cache(maxsize=1024)(os.path.basename)
+
+
+@lru_cache(maxsize=2048)
+def _resolve_step_source(source: str) -> str:
+    """
+    Provides the source to be used for a step (a directory is resolved to its
+    `__init__.robot` if available).
+
+    Note: cached because this is called for each step which is run (and the
+    files related to a suite aren't expected to be created/removed while
+    it's running).
+    """
+    if not source.endswith(ROBOT_AND_TXT_FILE_EXTENSIONS):
+        robot_init = os.path.join(source, "__init__.robot")
+        if os.path.exists(robot_init):
+            return robot_init
+    return source
+
 
 class RobotBreakpoint(object):
+    __slots__ = ["lineno", "condition", "hit_condition", "log_message", "hits"]
+
     def __init__(
         self,
         lineno: int,
@@ -138,7 +199,10 @@ class BusyWait(object):
         self.before_wait = []
         self.waited = 0
         self.proceeded = 0
-        self._condition = threading.Condition()
+        # Note: there's a single waiter (the thread running robot) and the
+        # waiter re-checks its state after each wake up, so, an Event is
+        # enough (and a `proceed()` done before `wait()` is not lost).
+        self._event = threading.Event()
 
     @implements(IBusyWait.pre_wait)
     def pre_wait(self):
@@ -148,22 +212,39 @@ class BusyWait(object):
     @implements(IBusyWait.wait)
     def wait(self):
         self.waited += 1
-        with self._condition:
-            self._condition.wait()
+        self._event.wait()
+        self._event.clear()
 
     @implements(IBusyWait.proceed)
     def proceed(self):
         self.proceeded += 1
-        with self._condition:
-            self._condition.notify_all()
+        self._event.set()
 
 
 class _BaseObjectToDAP(object):
     """
     Base class for classes which converts some object to the DAP.
+
+    The computed variables are cached (the stack is disposed when the thread
+    resumes and the cache is explicitly invalidated after an evaluation, which
+    may change the variables).
     """
 
+    __slots__ = ["_cached"]
+
+    def __init__(self):
+        self._cached: Optional[List[Variable]] = None
+
     def compute_as_dap(self) -> List[Variable]:
+        cached = self._cached
+        if cached is None:
+            cached = self._cached = self._compute_as_dap()
+        return cached
+
+    def invalidate_cache(self) -> None:
+        self._cached = None
+
+    def _compute_as_dap(self) -> List[Variable]:
         return []
 
 
@@ -172,17 +253,18 @@ class _ArgsAsDAP(_BaseObjectToDAP):
     Provides args as DAP variables.
     """
 
+    __slots__ = ["_keyword_args"]
+
     def __init__(self, keyword_args):
+        _BaseObjectToDAP.__init__(self)
         self._keyword_args = keyword_args
 
-    def compute_as_dap(self) -> List[Variable]:
-        from robotframework_debug_adapter.safe_repr import SafeRepr
-
-        lst = []
-        safe_repr = SafeRepr()
-        for i, arg in enumerate(self._keyword_args):
-            lst.append(Variable("Arg %s" % (i,), safe_repr(arg), variablesReference=0))
-        return lst
+    def _compute_as_dap(self) -> List[Variable]:
+        safe_repr = _get_safe_repr()
+        return [
+            Variable("Arg %d" % (i,), safe_repr(arg), variablesReference=0)
+            for i, arg in enumerate(self._keyword_args)
+        ]
 
 
 class _NonBuiltinVariablesAsDAP(_BaseObjectToDAP):
@@ -190,24 +272,24 @@ class _NonBuiltinVariablesAsDAP(_BaseObjectToDAP):
     Provides variables as DAP variables.
     """
 
+    __slots__ = ["_variables", "_builtins"]
+
     def __init__(self, variables):
+        _BaseObjectToDAP.__init__(self)
         self._variables = variables
         self._builtins = get_builtin_normalized_names()
 
-    def compute_as_dap(self) -> List[Variable]:
-        from robotframework_debug_adapter.safe_repr import SafeRepr
-
+    def _compute_as_dap(self) -> List[Variable]:
         variables = self._variables
         as_dct = variables.as_dict()
-        lst = []
-        safe_repr = SafeRepr()
+        safe_repr = _get_safe_repr()
+        accept = self._accept
 
-        for key, val in as_dct.items():
-            if self._accept(key):
-                lst.append(
-                    Variable(safe_repr(key), safe_repr(val), variablesReference=0)
-                )
-        return lst
+        return [
+            Variable(safe_repr(key), safe_repr(val), variablesReference=0)
+            for key, val in as_dct.items()
+            if accept(key)
+        ]
 
     def _accept(self, k: str) -> bool:
         from robotframework_ls.impl.variable_resolve import normalize_variable_name
@@ -223,11 +305,15 @@ class _BuiltinsAsDAP(_NonBuiltinVariablesAsDAP):
     Provides variables as DAP variables.
     """
 
+    __slots__ = ()
+
     def _accept(self, k: str) -> bool:
         return not _NonBuiltinVariablesAsDAP._accept(self, k)
 
 
 class _BaseFrameInfo(object):
+    __slots__ = ()
+
     @property
     def dap_frame(self):
         raise NotImplementedError("Not implemented in: %s" % (self.__class__,))
@@ -240,8 +326,10 @@ class _BaseFrameInfo(object):
 
 
 class _SuiteFrameInfo(_BaseFrameInfo):
-    def __init__(self, stack_list, dap_frame):
-        self._stack_list = weakref.ref(stack_list)
+    __slots__ = ["_stack_list", "_dap_frame"]
+
+    def __init__(self, stack_list_ref, dap_frame):
+        self._stack_list = stack_list_ref
         self._dap_frame = dap_frame
 
     @property
@@ -256,8 +344,10 @@ class _SuiteFrameInfo(_BaseFrameInfo):
 
 
 class _TestFrameInfo(_BaseFrameInfo):
-    def __init__(self, stack_list, dap_frame):
-        self._stack_list = weakref.ref(stack_list)
+    __slots__ = ["_stack_list", "_dap_frame"]
+
+    def __init__(self, stack_list_ref, dap_frame):
+        self._stack_list = stack_list_ref
         self._dap_frame = dap_frame
 
     @property
@@ -272,8 +362,10 @@ class _TestFrameInfo(_BaseFrameInfo):
 
 
 class _LogFrameInfo(_BaseFrameInfo):
-    def __init__(self, stack_list, dap_frame):
-        self._stack_list = weakref.ref(stack_list)
+    __slots__ = ["_stack_list", "_dap_frame"]
+
+    def __init__(self, stack_list_ref, dap_frame):
+        self._stack_list = stack_list_ref
         self._dap_frame = dap_frame
 
     @property
@@ -288,10 +380,28 @@ class _LogFrameInfo(_BaseFrameInfo):
 
 
 class _KeywordFrameInfo(_BaseFrameInfo):
+    __slots__ = [
+        "_stack_list",
+        "_dap_frame",
+        "_name",
+        "_lineno",
+        "_scopes",
+        "_args",
+        "_variables",
+        "_execution_context",
+    ]
+
     def __init__(
-        self, stack_list, dap_frame, name, lineno, args, variables, execution_context
+        self,
+        stack_list_ref,
+        dap_frame,
+        name,
+        lineno,
+        args,
+        variables,
+        execution_context,
     ):
-        self._stack_list = weakref.ref(stack_list)
+        self._stack_list = stack_list_ref
         self._dap_frame = dap_frame
         self._name = name
         self._lineno = lineno
@@ -366,10 +476,51 @@ class _StackInfo(object):
     breakpoint.
     """
 
-    def __init__(self):
+    __slots__ = [
+        "_thread_id",
+        "_frame_id_to_tid",
+        "_variables_reference_to_stack_info",
+        "_frame_id_to_frame_info",
+        "_dap_frames",
+        "_ref_id_to_children",
+        "_top_frame_id",
+        "_next_id",
+        "_self_ref",
+        "__weakref__",  # The frame infos have a weak reference to the stack.
+    ]
+
+    def __init__(
+        self,
+        thread_id: int,
+        frame_id_to_tid: Dict[int, int],
+        variables_reference_to_stack_info: Dict[int, "_StackInfo"],
+        next_id: INextId = next_id,
+    ):
+        """
+        :param thread_id:
+            The thread id to which the frames of this stack belong.
+
+        :param frame_id_to_tid:
+            Each frame added to this stack is registered as belonging to
+            `thread_id` in this dict.
+
+        :param variables_reference_to_stack_info:
+            Each variables reference registered in this stack is registered
+            as belonging to this stack in this dict.
+
+        :param next_id:
+            Used to generate the ids for the frames added to this stack.
+        """
+        self._thread_id = thread_id
+        self._frame_id_to_tid = frame_id_to_tid
+        self._variables_reference_to_stack_info = variables_reference_to_stack_info
         self._frame_id_to_frame_info: Dict[int, _BaseFrameInfo] = {}
         self._dap_frames = []
         self._ref_id_to_children = {}
+        self._top_frame_id: Optional[int] = None
+        self._next_id = next_id
+        # A single weak reference shared by all the frame infos.
+        self._self_ref = weakref.ref(self)
 
     def iter_frame_ids(self) -> Iterable[int]:
         """
@@ -380,66 +531,67 @@ class _StackInfo(object):
 
     def register_variables_reference(self, variables_reference, children):
         self._ref_id_to_children[variables_reference] = children
+        self._variables_reference_to_stack_info[variables_reference] = self
 
-    def add_keyword_entry_stack(
-        self, name, lineno, filename: str, args, variables, execution_context
+    def iter_variables_references(self) -> Iterable[int]:
+        return iter(self._ref_id_to_children)
+
+    def invalidate_variables_cache(self) -> None:
+        for children in self._ref_id_to_children.values():
+            if isinstance(children, _BaseObjectToDAP):
+                children.invalidate_cache()
+
+    def _add_frame(
+        self, name: str, lineno: int, filename: str, info_cls, *info_args
     ) -> int:
-        frame_id: int = next_id()
+        frame_id: int = self._next_id()
         dap_frame = StackFrame(
             frame_id,
             name=name,
-            line=lineno or 1,
+            line=lineno,
             column=0,
-            source=Source(name=os.path.basename(filename), path=filename),
+            source=Source(name=_basename(filename), path=filename),
         )
         self._dap_frames.append(dap_frame)
-        self._frame_id_to_frame_info[frame_id] = _KeywordFrameInfo(
-            self, dap_frame, name, lineno, args, variables, execution_context
+        if self._top_frame_id is None:
+            self._top_frame_id = frame_id
+        self._frame_id_to_frame_info[frame_id] = info_cls(
+            self._self_ref, dap_frame, *info_args
         )
+        self._frame_id_to_tid[frame_id] = self._thread_id
         return frame_id
 
-    def add_suite_entry_stack(self, name: str, filename: str) -> int:
-        frame_id: int = next_id()
-        dap_frame = StackFrame(
-            frame_id,
-            name=name,
-            line=1,
-            column=0,
-            source=Source(name=os.path.basename(filename), path=filename),
+    def add_keyword_entry_stack(
+        self, name, lineno, filename: str, args, variables, execution_context
+    ) -> int:
+        return self._add_frame(
+            name,
+            lineno or 1,
+            filename,
+            _KeywordFrameInfo,
+            name,
+            lineno,
+            args,
+            variables,
+            execution_context,
         )
-        self._dap_frames.append(dap_frame)
-        self._frame_id_to_frame_info[frame_id] = _SuiteFrameInfo(self, dap_frame)
-        return frame_id
 
-    def add_test_entry_stack(self, name: str, filename: str, lineno: int) -> int:
-        from robocorp_ls_core.debug_adapter_core.dap import dap_schema
+    def add_suite_entry_stack(self, name: str, filename: str) -> int:
+        return self._add_frame(name, 1, filename, _SuiteFrameInfo)
 
-        frame_id: int = next_id()
-        dap_frame = dap_schema.StackFrame(
-            frame_id,
-            name=name,
-            line=lineno,
-            column=0,
-            source=dap_schema.Source(name=os.path.basename(filename), path=filename),
-        )
-        self._dap_frames.append(dap_frame)
-        self._frame_id_to_frame_info[frame_id] = _TestFrameInfo(self, dap_frame)
-        return frame_id
+    def add_test_entry_stack(self, name: str, filename: str, lineno: int) -> int:
+        return self._add_frame(name, lineno, filename, _TestFrameInfo)
 
     def add_log_entry_stack(self, name: str, filename: str, lineno: int) -> int:
-        from robocorp_ls_core.debug_adapter_core.dap import dap_schema
+        return self._add_frame(name, lineno, filename, _LogFrameInfo)
 
-        frame_id: int = next_id()
-        dap_frame = dap_schema.StackFrame(
-            frame_id,
-            name=name,
-            line=lineno,
-            column=0,
-            source=dap_schema.Source(name=os.path.basename(filename), path=filename),
-        )
-        self._dap_frames.append(dap_frame)
-        self._frame_id_to_frame_info[frame_id] = _LogFrameInfo(self, dap_frame)
-        return frame_id
+    @property
+    def top_frame_id(self) -> Optional[int]:
+        """
+        The id of the frame where we're stopped (same as `dap_frames[0].id`)
+        or None if there are no frames.
+        """
+        return self._top_frame_id
 
     @property
     def dap_frames(self) -> List[StackFrame]:
@@ -488,15 +640,139 @@ class EvaluationResult(Exception):
         self.result = result
 
 
+@lru_cache(maxsize=256)
+def _get_keyword_call_from_expression(
+    expression: str,
+) -> Optional[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Provides the (name, args, assign) of the keyword call in the given
+    expression or None if it's not a single keyword call.
+
+    Note: cached as the same expressions are usually evaluated many times
+    (i.e.: watches are evaluated at each step) and parsing it is slow.
+    """
+    keyword_call = _tokenize_keyword_call(expression)
+    if keyword_call is not None:
+        return keyword_call
+
+    from robot.api import get_model  # type: ignore
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.robot_localization import LocalizationInfo
+
+    s = """
+*** Test Cases ***
+Evaluation
+    %s
+""" % (
+        expression,
+    )
+    model = get_model(s)
+    ast_utils.set_localization_info_in_model(model, LocalizationInfo("en"))
+    usage_info = list(
+        ast_utils.iter_keyword_usage_tokens(model, collect_args_as_keywords=False)
+    )
+    if len(usage_info) == 1:
+        usage = usage_info[0]
+        node = usage.node
+        return usage.name, tuple(node.args), tuple(node.assign)
+    return None
+
+
+def _tokenize_keyword_call(
+    expression: str,
+) -> Optional[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Fast path for `_get_keyword_call_from_expression`: just tokenizes the
+    expression (instead of parsing a whole suite with it) to get the
+    (name, args, assign) of a simple keyword call.
+
+    :return:
+        None if the expression is not a simple keyword call (in which case the
+        suite must be parsed to know what it is).
+    """
+    if "\n" in expression or "\r" in expression:
+        return None
+
+    try:
+        from robot.parsing.lexer.tokenizer import Tokenizer  # type: ignore
+
+        statements = list(Tokenizer().tokenize(expression, data_only=True))
+    except Exception:
+        return None
+
+    if len(statements) != 1:
+        return None
+
+    values = [token.value for token in statements[0]]
+    if not all(values):
+        return None
+
+    i = 0
+    for i, value in enumerate(values):
+        if _ASSIGN_RE.match(value) is None:
+            break
+    else:
+        return None  # Only assigns (no keyword name).
+
+    name = values[i]
+    if (
+        name[0] in "$@&%[:\\"
+        or name == "..."
+        or name.upper() in _NON_KEYWORD_CALL_NAMES
+        or name.lower().startswith(_GHERKIN_PREFIXES)
+    ):
+        return None
+
+    return name, tuple(values[i + 1 :]), tuple(values[:i])
+
+
+class _EvaluationFuture(object):
+    """
+    A lightweight replacement for `concurrent.futures.Future` (there's a single
+    setter -- the thread running robot -- and a single getter -- the thread
+    handling the DAP messages).
+    """
+
+    __slots__ = ["_done", "_result", "_exception"]
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result: Any = None
+        self._exception: Optional[BaseException] = None
+
+    def set_result(self, result: Any) -> None:
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, exception: BaseException) -> None:
+        self._exception = exception
+        self._done.set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @implements(IEvaluationFuture.result)
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self._done.wait(timeout):
+            raise TimeoutError("Evaluation did not finish in %s seconds." % timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def __typecheckself__(self) -> None:
+        from robocorp_ls_core.protocols import check_implements
+
+        _: IEvaluationFuture = check_implements(self)
+
+
 class _EvaluationInfo(object):
-    def __init__(self, frame_id: int, expression: str, context: str):
-        from concurrent import futures
-        from robocorp_ls_core.protocols import IFuture
+    __slots__ = ["frame_id", "expression", "context", "future"]
 
+    def __init__(self, frame_id: int, expression: str, context: str):
         self.frame_id = frame_id
         self.expression = expression
         self.context = context
-        self.future: IFuture[Any] = futures.Future()
+        self.future: IEvaluationFuture = _EvaluationFuture()
 
     def _do_eval(self, debugger_impl):
         frame_id = self.frame_id
@@ -511,7 +787,7 @@ class _EvaluationInfo(object):
         if not dap_frames:
             raise InvalidFrameIdError("No frames for evaluation.")
 
-        top_frame_id = dap_frames[0].id
+        top_frame_id = stack_info.top_frame_id
         if top_frame_id != frame_id:
             if get_log_level() >= 2:
                 log.debug(
@@ -552,13 +828,6 @@ class _EvaluationInfo(object):
             )
         log.info("Doing evaluation in the Keyword context: %s", info.name)
 
-        from robotframework_ls.impl.text_utilities import is_variable_text
-
-        from robot.libraries.BuiltIn import BuiltIn  # type: ignore
-        from robot.api import get_model  # type: ignore
-        from robotframework_ls.impl import ast_utils
-        from robotframework_ls.impl.robot_localization import LocalizationInfo
-
         # We can't really use
         # BuiltIn().evaluate(expression, modules, namespace)
         # because we can't set the variable_store used with it
@@ -566,9 +835,10 @@ class _EvaluationInfo(object):
 
         variable_store = info.variables.store
 
-        if is_variable_text(self.expression):
+        variable_match = _VARIABLE_RE.match(self.expression)
+        if variable_match is not None:
             try:
-                value = variable_store[self.expression[2:-1]]
+                value = variable_store[variable_match.group(1)]
             except Exception:
                 pass
             else:
@@ -580,7 +850,7 @@ class _EvaluationInfo(object):
                 return EvaluationResult(
                     ctx.namespace.get_runner(self.expression).longname
                 )
-            except:
+            except Exception:
                 log.exception("Error on hover evaluation: %s", self.expression)
                 return EvaluationResult("")
 
@@ -594,27 +864,12 @@ class _EvaluationInfo(object):
         #     return EvaluationResult(result)
 
         # Try to check if it's a KeywordCall.
-        s = """
-*** Test Cases ***
-Evaluation
-    %s
-""" % (
-            self.expression,
-        )
-        model = get_model(s)
-        ast_utils.set_localization_info_in_model(model, LocalizationInfo("en"))
-        usage_info = list(
-            ast_utils.iter_keyword_usage_tokens(model, collect_args_as_keywords=False)
-        )
-        if len(usage_info) == 1:
-            usage = next(iter(usage_info))
-            node = usage.node
-            name = usage.name
-
-            assign = node.assign
+        keyword_call = _get_keyword_call_from_expression(self.expression)
+        if keyword_call is not None:
+            name, args, assign = keyword_call
             from robot.running import Keyword
 
-            kw = Keyword(name, args=node.args, assign=assign)
+            kw = Keyword(name, args=args, assign=assign)
             ctx = info.execution_context
             return EvaluationResult(kw.run(ctx))
 
@@ -649,23 +904,34 @@ class _RobotDebuggerImpl(object):
 
     @implements(IRobotDebugger.reset)
     def reset(self):
-        from collections import deque
         from robotframework_debug_adapter._ignore_failures_in_stack import (
             IgnoreFailuresInStack,
         )
 
-        self._filename_to_line_to_breakpoint = {}
+        # (filename, lineno) -> breakpoint (a single lookup when running).
+        self._filename_lineno_to_breakpoint: Dict[
+            Tuple[str, int], IRobotBreakpoint
+        ] = {}
+        # filename -> keys in _filename_lineno_to_breakpoint (used to replace
+        # the breakpoints of a file).
+        self._filename_to_breakpoint_keys: Dict[str, List[Tuple[str, int]]] = {}
         self.busy_wait = BusyWait()
 
         self._run_state = STATE_RUNNING
         self._step_cmd: StepEnum = StepEnum.STEP_NONE
         self._reason: ReasonEnum = ReasonEnum.REASON_NOT_STOPPED
         self._next_id = next_id
-        self._stack_ctx_entries_deque = deque()
+        # Note: a list because entries are only added/removed at the end.
+        self._stack_ctx_entries: list = []
         self._stop_on_stack_len = 0
 
         self._tid_to_stack_info: Dict[int, _StackInfo] = {}
+        # The stack info is only built when the client actually asks for it
+        # (the entries are snapshotted when the thread is suspended).
+        self._tid_to_pending_stack_entries: Dict[int, tuple] = {}
+        self._stack_info_lock = threading.Lock()
         self._frame_id_to_tid = {}
+        self._variables_reference_to_stack_info: Dict[int, _StackInfo] = {}
         self._evaluations = []
         self._skip_breakpoints = 0
 
@@ -715,7 +981,14 @@ class _RobotDebuggerImpl(object):
         return None
 
     def _get_stack_info(self, thread_id) -> Optional[_StackInfo]:
-        return self._tid_to_stack_info.get(thread_id)
+        stack_info = self._tid_to_stack_info.get(thread_id)
+        if stack_info is None and thread_id in self._tid_to_pending_stack_entries:
+            with self._stack_info_lock:
+                entries = self._tid_to_pending_stack_entries.pop(thread_id, None)
+                if entries is not None:
+                    self._create_stack_info(thread_id, entries)
+                stack_info = self._tid_to_stack_info.get(thread_id)
+        return stack_info
 
     def get_frames(self, thread_id) -> Optional[List[StackFrame]]:
         stack_info = self._get_stack_info(thread_id)
@@ -740,11 +1013,10 @@ class _RobotDebuggerImpl(object):
         return stack_info.get_scopes(frame_id)
 
     def get_variables(self, variables_reference):
-        for stack_list in list(self._tid_to_stack_info.values()):
-            variables = stack_list.get_variables(variables_reference)
-            if variables is not None:
-                return variables
-        return None
+        stack_info = self._variables_reference_to_stack_info.get(variables_reference)
+        if stack_info is None:
+            return None
+        return stack_info.get_variables(variables_reference)
 
     def _get_filename(self, obj, msg) -> str:
         try:
@@ -755,62 +1027,76 @@ class _RobotDebuggerImpl(object):
                 return "<not available>"
 
             filename, _changed = file_utils.norm_file_to_client(str(source))
-        except:
+        except Exception:
             filename = "<Unable to get %s filename>" % (msg,)
             log.exception(filename)
 
         return filename
 
-    def _create_stack_info(self, thread_id: int):
-        stack_info = _StackInfo()
-
-        for entry in reversed(self._stack_ctx_entries_deque):
-            try:
-                if entry.__class__ == _StepEntry:
-                    name = entry.name
-                    lineno = entry.lineno
-                    variables = entry.variables
-                    args = entry.args
-                    execution_context = entry.execution_context
-                    filename = self._get_filename(entry, "Keyword")
-
-                    frame_id = stack_info.add_keyword_entry_stack(
-                        name, lineno, filename, args, variables, execution_context
-                    )
-
-                elif entry.__class__ == _SuiteEntry:
-                    name = "TestSuite: %s" % (entry.name,)
-                    filename = self._get_filename(entry, "TestSuite")
-
-                    frame_id = stack_info.add_suite_entry_stack(name, filename)
-
-                elif entry.__class__ == _TestEntry:
-                    name = "TestCase: %s" % (entry.name,)
-                    filename = self._get_filename(entry, "TestCase")
-
-                    frame_id = stack_info.add_test_entry_stack(
-                        name, filename, entry.lineno
-                    )
+    def _add_step_entry_to_stack(self, stack_info: _StackInfo, entry) -> None:
+        filename = self._get_filename(entry, "Keyword")
+        stack_info.add_keyword_entry_stack(
+            entry.name,
+            entry.lineno,
+            filename,
+            entry.args,
+            entry.variables,
+            entry.execution_context,
+        )
 
-                elif entry.__class__ == _LogEntry:
-                    name = "Log (%s)" % (entry.name,)
-                    filename = self._get_filename(entry, "Log")
+    def _add_suite_entry_to_stack(self, stack_info: _StackInfo, entry) -> None:
+        name = "TestSuite: %s" % (entry.name,)
+        filename = self._get_filename(entry, "TestSuite")
+        stack_info.add_suite_entry_stack(name, filename)
+
+    def _add_test_entry_to_stack(self, stack_info: _StackInfo, entry) -> None:
+        name = "TestCase: %s" % (entry.name,)
+        filename = self._get_filename(entry, "TestCase")
+        stack_info.add_test_entry_stack(name, filename, entry.lineno)
+
+    def _add_log_entry_to_stack(self, stack_info: _StackInfo, entry) -> None:
+        name = "Log (%s)" % (entry.name,)
+        filename = self._get_filename(entry, "Log")
+        stack_info.add_log_entry_stack(name, filename, entry.lineno)
+
+    # Maps the entry class to the (unbound) method which adds it to the stack.
+    _entry_class_to_add_to_stack = {
+        _StepEntry: _add_step_entry_to_stack,
+        _SuiteEntry: _add_suite_entry_to_stack,
+        _TestEntry: _add_test_entry_to_stack,
+        _LogEntry: _add_log_entry_to_stack,
+    }
+
+    def _create_stack_info(self, thread_id: int, stack_ctx_entries):
+        stack_info = _StackInfo(
+            thread_id,
+            self._frame_id_to_tid,
+            self._variables_reference_to_stack_info,
+            self._next_id,
+        )
+        entry_class_to_add_to_stack = self._entry_class_to_add_to_stack
 
-                    frame_id = stack_info.add_log_entry_stack(
-                        name, filename, entry.lineno
-                    )
-            except:
+        for entry in reversed(stack_ctx_entries):
+            add_to_stack = entry_class_to_add_to_stack.get(type(entry))
+            if add_to_stack is None:
+                continue
+            try:
+                add_to_stack(self, stack_info, entry)
+            except Exception:
                 log.exception("Error creating stack trace.")
 
-        for frame_id in stack_info.iter_frame_ids():
-            self._frame_id_to_tid[frame_id] = thread_id
-
         self._tid_to_stack_info[thread_id] = stack_info
 
     def _dispose_stack_info(self, thread_id):
-        stack_list = self._tid_to_stack_info.pop(thread_id)
+        with self._stack_info_lock:
+            self._tid_to_pending_stack_entries.pop(thread_id, None)
+            stack_list = self._tid_to_stack_info.pop(thread_id, None)
+        if stack_list is None:
+            return
         for frame_id in stack_list.iter_frame_ids():
             self._frame_id_to_tid.pop(frame_id)
+        for variables_reference in stack_list.iter_variables_references():
+            self._variables_reference_to_stack_info.pop(variables_reference, None)
 
     def get_current_thread_id(self, thread=None):
         from robotframework_debug_adapter.vendored import force_pydevd  # noqa
@@ -832,7 +1118,7 @@ class _RobotDebuggerImpl(object):
             )
         else:
             log.info("wait_suspended. Reason: %s", reason)
-        self._create_stack_info(thread_id)
+        self._tid_to_pending_stack_entries[thread_id] = tuple(self._stack_ctx_entries)
         try:
             self._run_state = STATE_PAUSED
             self._reason = reason
@@ -852,16 +1138,20 @@ class _RobotDebuggerImpl(object):
                     finally:
                         self._skip_breakpoints -= 1
 
+                if evaluations:
+                    # The evaluations may have changed the variables.
+                    stack_info = self._tid_to_stack_info.get(thread_id)
+                    if stack_info is not None:
+                        stack_info.invalidate_variables_cache()
+
             if self._step_cmd == StepEnum.STEP_NEXT:
-                self._stop_on_stack_len = len(self._stack_ctx_entries_deque)
+                self._stop_on_stack_len = len(self._stack_ctx_entries)
                 if self._stop_on_stack_len:
-                    if self._is_control_step(
-                        self._stack_ctx_entries_deque[-1].entry_type
-                    ):
+                    if self._is_control_step(self._stack_ctx_entries[-1].entry_type):
                         self._stop_on_stack_len += 1
 
             elif self._step_cmd == StepEnum.STEP_OUT:
-                self._stop_on_stack_len = len(self._stack_ctx_entries_deque) - 1
+                self._stop_on_stack_len = len(self._stack_ctx_entries) - 1
 
         finally:
             self._reason = ReasonEnum.REASON_NOT_STOPPED
@@ -918,12 +1208,21 @@ class _RobotDebuggerImpl(object):
         else:
             iter_in = [breakpoints]
         filename = file_utils.get_abs_path_real_path_and_base_from_file(filename)[1]
-        line_to_bp = {}
+        filename_lineno_to_breakpoint = self._filename_lineno_to_breakpoint
 
+        for key in self._filename_to_breakpoint_keys.pop(filename, ()):
+            filename_lineno_to_breakpoint.pop(key, None)
+
+        keys = []
         for bp in iter_in:
             log.info("Set breakpoint in %s: %s", filename, bp.lineno)
-            line_to_bp[bp.lineno] = bp
-        self._filename_to_line_to_breakpoint[filename] = line_to_bp
+            key = (filename, bp.lineno)
+            filename_lineno_to_breakpoint[key] = bp
+            keys.append(key)
+        if keys:
+            # Note: an empty dict means that there are no breakpoints at all
+            # (used for the fast path when running).
+            self._filename_to_breakpoint_keys[filename] = keys
 
     # ------------------------------------------------- RobotFramework listeners
 
@@ -959,7 +1258,7 @@ class _RobotDebuggerImpl(object):
 
             else:
                 name = str(control_flow_stmt).strip()
-        except:
+        except Exception:
             pass
 
         if not name:
@@ -972,9 +1271,8 @@ class _RobotDebuggerImpl(object):
             lineno = -1
             source = None
 
-        try:
-            args = control_flow_stmt.args
-        except AttributeError:
+        args = getattr(control_flow_stmt, "args", None)
+        if args is None:
             args = []
         entry_type = "KEYWORD"
         self._before_run_step(
@@ -994,7 +1292,7 @@ class _RobotDebuggerImpl(object):
         name = ""
         try:
             name = step.name
-        except:
+        except Exception:
             pass
         if not name:
             name = step.__class__.__name__
@@ -1004,9 +1302,8 @@ class _RobotDebuggerImpl(object):
         except AttributeError:
             lineno = -1
             source = None
-        try:
-            args = step.args
-        except AttributeError:
+        args = getattr(step, "args", None)
+        if args is None:
             args = []
         ctx = runner._context
         entry_type = "KEYWORD"
@@ -1023,7 +1320,7 @@ class _RobotDebuggerImpl(object):
             name = str(step).strip()
             if not name:
                 name = step.__class__.__name__
-        except:
+        except Exception:
             name = "<Unable to get keyword name>"
         try:
             lineno = step.lineno
@@ -1031,9 +1328,8 @@ class _RobotDebuggerImpl(object):
         except AttributeError:
             lineno = -1
             source = None
-        try:
-            args = step.args
-        except AttributeError:
+        args = getattr(step, "args", None)
+        if args is None:
             args = []
         ctx = step_runner._context
         entry_type = "KEYWORD"
@@ -1069,21 +1365,19 @@ class _RobotDebuggerImpl(object):
         if self._is_control_step(entry_type):
             self._stop_on_stack_len += 1
 
-        if source and not source.endswith(ROBOT_AND_TXT_FILE_EXTENSIONS):
-            robot_init = os.path.join(source, "__init__.robot")
-            if os.path.exists(robot_init):
-                source = robot_init
+        if source:
+            source = _resolve_step_source(source)
 
         if not source or lineno is None:
             # RunKeywordIf doesn't have a source, so, just show the caller source.
-            for entry in reversed(self._stack_ctx_entries_deque):
+            for entry in reversed(self._stack_ctx_entries):
                 if not source:
                     source = self._source_as_str(entry.source)
                 if lineno is None:
                     lineno = entry.lineno
                 break
 
-        self._stack_ctx_entries_deque.append(
+        self._stack_ctx_entries.append(
             _StepEntry(
                 name,
                 lineno,
@@ -1099,107 +1393,111 @@ class _RobotDebuggerImpl(object):
         if self._skip_breakpoints:
             return
 
-        source = file_utils.get_abs_path_real_path_and_base_from_file(source)[1]
-        log.debug(
-            "run_step %s, %s - step: %s - %s\n", name, lineno, self._step_cmd, source
-        )
-        lines = self._filename_to_line_to_breakpoint.get(source)
+        filename_lineno_to_breakpoint = self._filename_lineno_to_breakpoint
+        step_cmd = self._step_cmd
+        if not filename_lineno_to_breakpoint and step_cmd == StepEnum.STEP_NONE:
+            # Fast path: without breakpoints nor a step command there's no
+            # reason to stop.
+            return
 
+        source = file_utils.get_abs_path_real_path_and_base_from_file(source)[1]
+        if get_log_level() >= 2:
+            log.debug(
+                "run_step %s, %s - step: %s - %s\n", name, lineno, step_cmd, source
+            )
         stop_reason: Optional[ReasonEnum] = None
-        step_cmd = self._step_cmd
-        if lines:
-            bp: Optional[IRobotBreakpoint] = lines.get(lineno)
-            if bp:
-                # Mark it to stop and then go over exclusions based on condition
-                # and hit_condition.
-                stop_reason = ReasonEnum.REASON_BREAKPOINT
-
-                if bp.condition:
-                    try:
-                        from robot.variables.evaluation import (
-                            evaluate_expression,
-                        )  # noqa
-
-                        curr_vars = ctx.variables.current
-
-                        # API changed in: https://github.com/robotframework/robotframework/commit/27a533e4edf0aebd699c15d7b32a30e76fc7638c
-                        major, minor = get_robot_major_minor_version()
-                        if (major, minor) >= (6, 1):
-                            use_vars_or_store = curr_vars
-                        else:
-                            use_vars_or_store = curr_vars.store
-
-                        hit = bool(
-                            evaluate_expression(
-                                curr_vars.replace_string(bp.condition),
-                                use_vars_or_store,
-                            )
+        bp: Optional[IRobotBreakpoint] = filename_lineno_to_breakpoint.get(
+            (source, lineno)
+        )
+        if bp:
+            # Mark it to stop and then go over exclusions based on condition
+            # and hit_condition.
+            stop_reason = ReasonEnum.REASON_BREAKPOINT
+
+            if bp.condition:
+                try:
+                    from robot.variables.evaluation import (
+                        evaluate_expression,
+                    )  # noqa
+
+                    curr_vars = ctx.variables.current
+
+                    # API changed in: https://github.com/robotframework/robotframework/commit/27a533e4edf0aebd699c15d7b32a30e76fc7638c
+                    major, minor = get_robot_major_minor_version()
+                    if (major, minor) >= (6, 1):
+                        use_vars_or_store = curr_vars
+                    else:
+                        use_vars_or_store = curr_vars.store
+
+                    hit = bool(
+                        evaluate_expression(
+                            curr_vars.replace_string(bp.condition),
+                            use_vars_or_store,
                         )
-                        if not hit:
-                            log.debug(
-                                "Breakpoint at %s (%s) skipped (%s evaluated to False)",
-                                source,
-                                lineno,
-                                bp.condition,
-                            )
-                            stop_reason = None
-                    except:
-                        log.exception("Error evaluating: %s", bp.condition)
-
-                if stop_reason is not None and bp.hit_condition:
-                    bp.hits += 1
-                    if bp.hits != bp.hit_condition:
+                    )
+                    if not hit:
                         log.debug(
-                            "Breakpoint at %s (%s) skipped (hit condition: %s evaluated to False)",
+                            "Breakpoint at %s (%s) skipped (%s evaluated to False)",
                             source,
                             lineno,
-                            bp.hit_condition,
+                            bp.condition,
                         )
                         stop_reason = None
+                except Exception:
+                    log.exception("Error evaluating: %s", bp.condition)
+
+            if stop_reason is not None and bp.hit_condition:
+                bp.hits += 1
+                if bp.hits != bp.hit_condition:
+                    log.debug(
+                        "Breakpoint at %s (%s) skipped (hit condition: %s evaluated to False)",
+                        source,
+                        lineno,
+                        bp.hit_condition,
+                    )
+                    stop_reason = None
 
-                if stop_reason is not None:
-                    if bp.log_message:
-                        curr_vars = ctx.variables.current
-                        try:
-                            message = curr_vars.replace_string(bp.log_message)
-                        except Exception as e:
-                            message = (
-                                f"Error evaluating: {bp.log_message}.\nError: {e}\n"
-                            )
-
-                        if not message.endswith(("\n", "\r")):
-                            message += "\n"
-
-                        self.write_message(
-                            OutputEvent(
-                                body=OutputEventBody(
-                                    source=Source(path=source),
-                                    line=lineno,
-                                    output=message,
-                                    category="console",
-                                )
+            if stop_reason is not None:
+                if bp.log_message:
+                    curr_vars = ctx.variables.current
+                    try:
+                        message = curr_vars.replace_string(bp.log_message)
+                    except Exception as e:
+                        message = f"Error evaluating: {bp.log_message}.\nError: {e}\n"
+
+                    if not message.endswith(("\n", "\r")):
+                        message += "\n"
+
+                    self.write_message(
+                        OutputEvent(
+                            body=OutputEventBody(
+                                source=Source(path=source),
+                                line=lineno,
+                                output=message,
+                                category="console",
                             )
                         )
-                        log.debug(
-                            "Breakpoint at %s (%s) skipped (due to being a log message breakpoint).",
-                            source,
-                            lineno,
-                        )
-                        stop_reason = None
+                    )
+                    log.debug(
+                        "Breakpoint at %s (%s) skipped (due to being a log message breakpoint).",
+                        source,
+                        lineno,
+                    )
+                    stop_reason = None
 
         if stop_reason is None and step_cmd is not None:
             if step_cmd == StepEnum.STEP_IN:
                 stop_reason = ReasonEnum.REASON_STEP
 
             elif step_cmd in (StepEnum.STEP_NEXT, StepEnum.STEP_OUT):
-                if len(self._stack_ctx_entries_deque) <= self._stop_on_stack_len:
+                if len(self._stack_ctx_entries) <= self._stop_on_stack_len:
                     stop_reason = ReasonEnum.REASON_STEP
 
         if stop_reason is not None:
             self.wait_suspended(stop_reason)
 
     def _after_run_step(self):
-        entry = self._stack_ctx_entries_deque.pop()
+        entry = self._stack_ctx_entries.pop()
 
         if entry.entry_type == "KEYWORD":
             self._ignore_failures_in_stack.pop()
@@ -1208,7 +1506,7 @@ class _RobotDebuggerImpl(object):
             self._stop_on_stack_len -= 1
 
     def start_suite(self, data, result):
-        self._stack_ctx_entries_deque.append(
+        self._stack_ctx_entries.append(
             _SuiteEntry(data.name, self._source_as_str(data.source), "SUITE")
         )
 
@@ -1216,45 +1514,41 @@ class _RobotDebuggerImpl(object):
         self._pop("SUITE", data.name)
 
     def _pop(self, entry_type, name):
-        if not self._stack_ctx_entries_deque:
+        if not self._stack_ctx_entries:
             self._log_critical_stack(
                 f"Robot Debugger Warning: unable to pop {entry_type} - {name} (empty queue)."
             )
         else:
-            stack_entry = self._stack_ctx_entries_deque[-1]
+            stack_entry = self._stack_ctx_entries[-1]
             if stack_entry.entry_type == entry_type and stack_entry.name == name:
-                self._stack_ctx_entries_deque.pop()
+                self._stack_ctx_entries.pop()
             else:
-                for i, stack_entry in enumerate(
-                    reversed(self._stack_ctx_entries_deque)
-                ):
+                for i, stack_entry in enumerate(reversed(self._stack_ctx_entries)):
                     if (
                         stack_entry.entry_type == entry_type
                         and stack_entry.name == name
                     ):
                         for _ in range(i):
-                            stack_entry = self._stack_ctx_entries_deque.pop()
+                            stack_entry = self._stack_ctx_entries.pop()
                             self._log_critical_stack(
                                 f"Robot Debugger Warning: {stack_entry.entry_type} - {stack_entry.name} did not have a corresponding pop."
                             )
 
                         # The current one (which is a match).
-                        self._stack_ctx_entries_deque.pop()
+                        self._stack_ctx_entries.pop()
                         return
 
                 if entry_type in ("TEST", "SUITE"):
-                    for i, stack_entry in enumerate(
-                        reversed(self._stack_ctx_entries_deque)
-                    ):
+                    for i, stack_entry in enumerate(reversed(self._stack_ctx_entries)):
                         if stack_entry.entry_type == entry_type:
                             for _ in range(i):
-                                stack_entry = self._stack_ctx_entries_deque.pop()
+                                stack_entry = self._stack_ctx_entries.pop()
                                 self._log_critical_stack(
                                     f"Robot Debugger Warning: {stack_entry.entry_type} - {stack_entry.name} did not have a corresponding pop."
                                 )
 
                             # The current one (which is a partial match).
-                            stack_entry = self._stack_ctx_entries_deque.pop()
+                            stack_entry = self._stack_ctx_entries.pop()
                             self._log_critical_stack(
                                 f"Robot Debugger Warning: {stack_entry.entry_type} - {stack_entry.name} pop just by type. Actual request: {entry_type} - {name}"
                             )
@@ -1268,7 +1562,7 @@ class _RobotDebuggerImpl(object):
         log.critical(msg)
 
     def start_test(self, data, result):
-        self._stack_ctx_entries_deque.append(
+        self._stack_ctx_entries.append(
             _TestEntry(data.name, self._source_as_str(data.source), data.lineno, "TEST")
         )
 
@@ -1306,9 +1600,9 @@ class _RobotDebuggerImpl(object):
                 path, lineno = source_and_line
                 source = Source(path=path)
             else:
-                if self._stack_ctx_entries_deque:
+                if self._stack_ctx_entries:
                     lineno = 0
-                    step_entry: _StepEntry = self._stack_ctx_entries_deque[-1]
+                    step_entry: _StepEntry = self._stack_ctx_entries[-1]
                     path = self._source_as_str(step_entry.source)
                     source = Source(path=path)
                     try:
@@ -1343,7 +1637,7 @@ class _RobotDebuggerImpl(object):
                 )
             )
             self._break_on_log_or_system_message(message, path, lineno)
-        except:
+        except Exception:
             log.exception("Error handling log_message.")
 
     @classmethod
@@ -1374,7 +1668,7 @@ class _RobotDebuggerImpl(object):
 
             if path is not None and lineno is not None:
                 entry = _LogEntry(message.level, path, lineno, "LOG")
-                self._stack_ctx_entries_deque.append(entry)
+                self._stack_ctx_entries.append(entry)
 
             self._exc_name = exc_name + message.message
             self._exc_description = message.message
@@ -1385,7 +1679,7 @@ class _RobotDebuggerImpl(object):
                 self._exc_description = None
 
                 if entry is not None:
-                    self._stack_ctx_entries_deque.pop()
+                    self._stack_ctx_entries.pop()
 
 
 def _patch(
@@ -1451,7 +1745,7 @@ def _apply_monkeypatching_before_4_b_2(impl):
             impl.before_control_flow_stmt,
             impl.after_control_flow_stmt,
         )
-    except:
+    except Exception:
         # This may not be the same on older versions...
         pass
 
@@ -1461,7 +1755,7 @@ def _apply_monkeypatching_before_4_b_2(impl):
         _patch(
             If, impl, "run", impl.before_control_flow_stmt, impl.after_control_flow_stmt
         )
-    except:
+    except Exception:
         # This may not be the same on older versions...
         pass
 
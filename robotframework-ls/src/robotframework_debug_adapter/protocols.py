@@ -2,7 +2,6 @@
 import sys
 from typing import TypeVar, List, Union, Any, Optional, Iterable
 from robocorp_ls_core.debug_adapter_core.dap.dap_schema import StackFrame
-from robocorp_ls_core.protocols import IFuture
 
 if sys.version_info[:2] < (3, 8):
 
@@ -16,8 +15,18 @@ T = TypeVar("T")
 Y = TypeVar("Y", covariant=True)
 
 
+class IEvaluationFuture(Protocol):
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Waits for the evaluation to finish and provides its result (or raises
+        the exception raised during the evaluation).
+
+        :raises TimeoutError: if the evaluation didn't finish in the given timeout.
+        """
+
+
 class IEvaluationInfo(Protocol):
-    future: IFuture[Any]
+    future: IEvaluationFuture
 
 
 class IRobotBreakpoint(Protocol):
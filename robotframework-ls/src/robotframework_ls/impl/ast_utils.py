@@ -1,3 +1,4 @@
+import re
 import sys
 from typing import (
     Iterator,
@@ -10,6 +11,8 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    FrozenSet,
+    Set,
     Sequence,
 )
 
@@ -33,10 +36,12 @@ from robotframework_ls.impl.text_utilities import normalize_robot_name
 from robocorp_ls_core.basic import isinstance_name
 import functools
 import weakref
+from collections import defaultdict
 import threading
 import typing
 import itertools
 from robotframework_ls.impl.robot_localization import LocalizationInfo
+from robotframework_ls.impl import robot_constants
 from functools import lru_cache
 
 
@@ -57,22 +62,28 @@ class _NodesProviderVisitor(ast_module.NodeVisitor):
 
 
 class _PrinterVisitor(ast_module.NodeVisitor):
-    def __init__(self, stream):
+    def __init__(self):
         ast_module.NodeVisitor.__init__(self)
         self._level = 0
-        self._stream = stream
+        # Lines are buffered and written at once in `write_to`.
+        self._buf: List[str] = []
 
-    def _replace_spacing(self, txt):
-        curr_len = len(txt)
-        delta = 80 - curr_len
-        return txt.replace("*SPACING*", " " * delta)
+    def _add_line(self, prefix, suffix):
+        # Pads the line so that it'd have 80 chars if the padding were
+        # 9 chars long (i.e.: as if it had a "*SPACING*" mark in it).
+        delta = 80 - len(prefix) - len(suffix) - 12
+        self._buf.append(f"{prefix} {' ' * delta} {suffix}\n")
+
+    def write_to(self, stream):
+        stream.write("".join(self._buf))
+        self._buf = []
 
     def generic_visit(self, node):
         # Note: prints line and col offsets 0-based (even if the ast is 1-based for
         # lines and 0-based for columns).
         self._level += 1
+        indent = "  " * self._level
         try:
-            indent = "  " * self._level
             node_lineno = node.lineno
             if node_lineno != -1:
                 # Make 0-based
@@ -81,18 +92,9 @@ class _PrinterVisitor(ast_module.NodeVisitor):
             if node_end_lineno != -1:
                 # Make 0-based
                 node_end_lineno -= 1
-            self._stream.write(
-                self._replace_spacing(
-                    "%s%s *SPACING* (%s, %s) -> (%s, %s)\n"
-                    % (
-                        indent,
-                        node.__class__.__name__,
-                        node_lineno,
-                        node.col_offset,
-                        node_end_lineno,
-                        node.end_col_offset,
-                    )
-                )
+            self._add_line(
+                f"{indent}{node.__class__.__name__}",
+                f"({node_lineno}, {node.col_offset}) -> ({node_end_lineno}, {node.end_col_offset})",
             )
             tokens = getattr(node, "tokens", [])
             for token in tokens:
@@ -101,18 +103,10 @@ class _PrinterVisitor(ast_module.NodeVisitor):
                     # Make 0-based
                     token_lineno -= 1
 
-                self._stream.write(
-                    self._replace_spacing(
-                        "%s- %s, '%s' *SPACING* (%s, %s->%s)\n"
-                        % (
-                            indent,
-                            token.type,
-                            token.value.replace("\n", "\\n").replace("\r", "\\r"),
-                            token_lineno,
-                            token.col_offset,
-                            token.end_col_offset,
-                        )
-                    )
+                value = token.value.replace("\n", "\\n").replace("\r", "\\r")
+                self._add_line(
+                    f"{indent}- {token.type}, '{value}'",
+                    f"({token_lineno}, {token.col_offset}->{token.end_col_offset})",
                 )
 
             ast_module.NodeVisitor.generic_visit(self, node)
@@ -127,6 +121,13 @@ class _AbstractIndexer:
     def iter_indexed(self, clsname):
         pass
 
+    def iter_all_indexed(self) -> Iterator[NodeInfo]:
+        """
+        Provides all the nodes indexed (grouped by the class name, so, not
+        in the document order).
+        """
+        pass
+
     @property
     def ast(self):
         return self._weak_ast()
@@ -136,7 +137,7 @@ class _FullIndexer(_AbstractIndexer):
     def __init__(self, weak_ast: "weakref.ref[ast_module.AST]"):
         self._weak_ast = weak_ast
         self._lock = threading.Lock()
-        self._name_to_node_info_lst: Dict[str, List[NodeInfo]] = {}
+        self._name_to_node_info_lst: Dict[str, List[NodeInfo]] = defaultdict(list)
         self._indexed_full = False
 
     def _index(self):
@@ -148,12 +149,11 @@ class _FullIndexer(_AbstractIndexer):
             if ast is None:
                 raise RuntimeError("AST already garbage collected.")
 
-            for stack, node in _iter_nodes(ast):
-                lst = self._name_to_node_info_lst.get(node.__class__.__name__)
-                if lst is None:
-                    lst = self._name_to_node_info_lst[node.__class__.__name__] = []
-
-                lst.append(NodeInfo(tuple(stack), node))
+            name_to_node_info_lst = self._name_to_node_info_lst
+            for stack_tuple, node in _iter_nodes_recursive_with_stack_tuple(ast):
+                name_to_node_info_lst[type(node).__name__].append(
+                    NodeInfo(stack_tuple, node)
+                )
             self._indexed_full = True
 
     def iter_indexed(self, clsname: str) -> Iterator[NodeInfo]:
@@ -162,6 +162,13 @@ class _FullIndexer(_AbstractIndexer):
 
         yield from iter(self._name_to_node_info_lst.get(clsname, ()))
 
+    def iter_all_indexed(self) -> Iterator[NodeInfo]:
+        if not self._indexed_full:
+            self._index()
+
+        for node_infos in self._name_to_node_info_lst.values():
+            yield from iter(node_infos)
+
 
 class _SectionIndexer(_AbstractIndexer):
     """
@@ -194,7 +201,9 @@ class _SectionIndexer(_AbstractIndexer):
     def __init__(self, weak_ast):
         self._weak_ast = weak_ast
         self._lock = threading.Lock()
-        self._first_level_name_to_node_info_lst: Dict[str, List[NodeInfo]] = {}
+        self._first_level_name_to_node_info_lst: Dict[
+            str, List[NodeInfo]
+        ] = defaultdict(list)
 
         # We always start by indexing the first level in this case (to get the sections
         # such as 'CommentSection', 'SettingSection', etc), which should be fast.
@@ -203,35 +212,57 @@ class _SectionIndexer(_AbstractIndexer):
         if ast is None:
             raise RuntimeError("AST already garbage collected.")
 
-        for stack, node in _iter_nodes(ast, recursive=False):
-            lst = self._first_level_name_to_node_info_lst.get(node.__class__.__name__)
-            if lst is None:
-                lst = self._first_level_name_to_node_info_lst[
-                    node.__class__.__name__
-                ] = []
-
-            lst.append(NodeInfo(tuple(stack), node))
+        # clsname -> the result of _compute_node_infos_to_search(clsname)
+        self._clsname_to_node_infos_to_search: Dict[
+            str, Tuple[bool, Sequence[NodeInfo]]
+        ] = {}
+
+        first_level_name_to_node_info_lst = self._first_level_name_to_node_info_lst
+        # Not recursive: the stack is the same for all the nodes.
+        stack_tuple: Optional[Tuple[INode, ...]] = None
+        for stack, node in _iter_nodes_not_recursive(ast):
+            if stack_tuple is None:
+                stack_tuple = tuple(stack)
+            first_level_name_to_node_info_lst[type(node).__name__].append(
+                NodeInfo(stack_tuple, node)
+            )
 
-    def iter_indexed(self, clsname: str) -> Iterator[NodeInfo]:
+    def _compute_node_infos_to_search(
+        self, clsname: str
+    ) -> Tuple[bool, Sequence[NodeInfo]]:
+        """
+        :return: a tuple(is_top_level, node_infos) where `node_infos` are
+        the top level node infos to be provided (if `is_top_level`) or the
+        ones where `clsname` should be searched.
+        """
+        first_level_name_to_node_info_lst = self._first_level_name_to_node_info_lst
         top_level = self.INNER_INSIDE_TOP_LEVEL.get(clsname)
         if top_level is not None:
-            lst = self._first_level_name_to_node_info_lst.get(top_level)
-            if lst is not None:
-                for node_info in lst:
-                    indexer = _obtain_ast_indexer(node_info.node)
-                    yield from indexer.iter_indexed(clsname)
+            return False, first_level_name_to_node_info_lst.get(top_level, ())
+
+        if clsname in self.TOP_LEVEL:
+            return True, first_level_name_to_node_info_lst.get(clsname, ())
+
+        # i.e.: We don't know what we should be getting, so, just check
+        # everything...
+        return False, tuple(
+            itertools.chain.from_iterable(first_level_name_to_node_info_lst.values())
+        )
+
+    def iter_indexed(self, clsname: str) -> Iterator[NodeInfo]:
+        node_infos_to_search = self._clsname_to_node_infos_to_search.get(clsname)
+        if node_infos_to_search is None:
+            node_infos_to_search = self._clsname_to_node_infos_to_search[
+                clsname
+            ] = self._compute_node_infos_to_search(clsname)
+
+        is_top_level, node_infos = node_infos_to_search
+        if is_top_level:
+            yield from iter(node_infos)
         else:
-            if clsname in self.TOP_LEVEL:
-                yield from iter(
-                    self._first_level_name_to_node_info_lst.get(clsname, ())
-                )
-            else:
-                # i.e.: We don't know what we should be getting, so, just check
-                # everything...
-                for lst in self._first_level_name_to_node_info_lst.values():
-                    for node_info in lst:
-                        indexer = _obtain_ast_indexer(node_info.node)
-                        yield from indexer.iter_indexed(clsname)
+            for node_info in node_infos:
+                indexer = _obtain_ast_indexer(node_info.node)
+                yield from indexer.iter_indexed(clsname)
 
 
 class _ASTIndexer(_AbstractIndexer):
@@ -247,22 +278,39 @@ class _ASTIndexer(_AbstractIndexer):
             # Always cache fully
             self._indexer = _FullIndexer(self._weak_ast)
 
-        self._additional_caches: Dict[Hashable, Tuple[Any, ...]] = {}
+        self._additional_caches: Dict[Hashable, Any] = {}
 
-    def iter_cached(
-        self, cache_key: Hashable, compute: Callable, *args
-    ) -> Iterator[Any]:
-        try:
-            cached = self._additional_caches[cache_key]
-        except KeyError:
-            cached = tuple(compute(self, *args))
-            self._additional_caches[cache_key] = cached
+    def get_cached_value(self, cache_key: Hashable, compute: Callable, *args) -> Any:
+        """
+        Provides the (cached) result of `compute(self, *args)`.
+        """
+        cached = self._additional_caches.get(cache_key)
+        if cached is None:
+            cached = self._additional_caches[cache_key] = compute(self, *args)
+        return cached
 
-        yield from iter(cached)
+    def get_cached(
+        self, cache_key: Hashable, compute: Callable, *args
+    ) -> Tuple[Any, ...]:
+        """
+        Provides the (cached) results of `compute(self, *args)` as a tuple.
+        """
+        cached = self._additional_caches.get(cache_key)
+        if cached is None:
+            cached = self._additional_caches[cache_key] = tuple(compute(self, *args))
+        return cached
 
     def iter_indexed(self, clsname: str) -> Iterator[NodeInfo]:
         return self._indexer.iter_indexed(clsname)
 
+    def iter_all_indexed(self) -> Iterator[NodeInfo]:
+        """
+        Note: not available for the File (which is indexed by sections, so,
+        the sections should be used instead).
+        """
+        assert not self._is_root, "iter_all_indexed is not available for File."
+        return self._indexer.iter_all_indexed()
+
 
 @lru_cache(None)
 def _get_error_tokens():
@@ -277,8 +325,12 @@ def _get_error_tokens():
     return tuple(ret)
 
 
-def _get_errors_from_tokens(node):
-    error_tokens = _get_error_tokens()
+def _get_errors_from_tokens(node, error_tokens: Tuple[str, ...]):
+    """
+    :param error_tokens:
+        The result of `_get_error_tokens()` (received as a parameter so that
+        callers going over many nodes get it only once).
+    """
     for token in node.tokens:
         if token.type in error_tokens:
             start = (token.lineno - 1, token.col_offset)
@@ -288,54 +340,118 @@ def _get_errors_from_tokens(node):
 
 
 def _obtain_ast_indexer(ast):
-    try:
-        indexer = ast.__ast_indexer__
-    except:
+    indexer = getattr(ast, "__ast_indexer__", None)
+    if indexer is None:
         indexer = ast.__ast_indexer__ = _ASTIndexer(ast)
     return indexer
 
 
+def _get_indexer(ast) -> _ASTIndexer:
+    """
+    :param ast:
+        Either an ast or an indexer (in which case it's returned as is).
+    """
+    if hasattr(ast, "iter_indexed"):
+        return ast
+    return _obtain_ast_indexer(ast)
+
+
 def _convert_ast_to_indexer(func):
     @functools.wraps(func)
     def new_func(ast, *args, **kwargs):
-        if hasattr(ast, "iter_indexed"):
-            indexer = ast
-        else:
-            try:
-                indexer = ast.__ast_indexer__
-            except:
-                indexer = ast.__ast_indexer__ = _ASTIndexer(ast)
-
-        return func(indexer, *args, **kwargs)
+        return func(_get_indexer(ast), *args, **kwargs)
 
     return new_func
 
 
 def collect_errors(node) -> List[Error]:
-    errors = []
+    errors: List[Error] = []
 
     use_errors_attribute = "errors" in node.__class__._attributes
+    error_tokens = _get_error_tokens()
 
-    for _stack, node in _iter_nodes(node, recursive=True):
-        if node.__class__.__name__ == "Error":
-            errors.extend(_get_errors_from_tokens(node))
-        elif node.__class__.__name__ == "InvalidSection":
-            # On 6.1 we don't have an Error in this case, we have a regular class
-            # named "InvalidSection".
-            errors.extend(_get_errors_from_tokens(node.header))
-
-        elif use_errors_attribute:
-            node_errors = getattr(node, "errors", ())
-            if node_errors:
-                for error in node_errors:
-                    errors.append(create_error_from_node(node, error, tokens=[node]))
-
-        if len(errors) >= MAX_ERRORS:
-            break
+    if node.__class__.__name__ == "File":
+        # The sections are usually already indexed, so, use the indexer instead
+        # of going through all the nodes again (the sections are checked in
+        # order and a section is only indexed if MAX_ERRORS wasn't reached).
+        for _stack, section in _iter_nodes_not_recursive(node):
+            if _add_node_errors(errors, section, use_errors_attribute, error_tokens):
+                return errors
+
+            for child in _get_nodes_which_may_have_errors(
+                section, use_errors_attribute
+            ):
+                if _add_node_errors(errors, child, use_errors_attribute, error_tokens):
+                    return errors
+    else:
+        for _stack, child in _iter_nodes_recursive(node):
+            if _add_node_errors(errors, child, use_errors_attribute, error_tokens):
+                return errors
 
     return errors
 
 
+def _add_node_errors(
+    errors: List[Error],
+    node,
+    use_errors_attribute: bool,
+    error_tokens: Tuple[str, ...],
+) -> bool:
+    """
+    Adds the errors of the given node to `errors`.
+
+    :return: True if MAX_ERRORS was reached and False otherwise.
+    """
+    cls_name = type(node).__name__
+    if cls_name == "Error":
+        errors.extend(_get_errors_from_tokens(node, error_tokens))
+    elif cls_name == "InvalidSection":
+        # On 6.1 we don't have an Error in this case, we have a regular class
+        # named "InvalidSection".
+        errors.extend(_get_errors_from_tokens(node.header, error_tokens))
+
+    elif use_errors_attribute:
+        node_errors = getattr(node, "errors", ())
+        if not node_errors:
+            return False
+        for error in node_errors:
+            errors.append(create_error_from_node(node, error, tokens=[node]))
+
+    else:
+        return False
+
+    # Only checked when something may have been added.
+    return len(errors) >= MAX_ERRORS
+
+
+def _get_nodes_which_may_have_errors(
+    section, use_errors_attribute: bool
+) -> List[INode]:
+    """
+    :return: the nodes inside the given section which may have errors (in the
+    same order in which they'd be found when going through all the nodes).
+    """
+    found: List[NodeInfo] = []
+    for node_info in _obtain_ast_indexer(section).iter_all_indexed():
+        node = node_info.node
+        if type(node).__name__ in ("Error", "InvalidSection") or (
+            use_errors_attribute and getattr(node, "errors", ())
+        ):
+            found.append(node_info)
+
+    # The indexer groups the nodes by the class name, so, sort them by the
+    # position (a parent starts at the same position as its first child, so,
+    # the stack length is used to provide the parent first).
+    found.sort(
+        key=lambda node_info: (
+            getattr(node_info.node, "lineno", -1),
+            getattr(node_info.node, "col_offset", -1),
+            len(node_info.stack),
+        )
+    )
+    return [node_info.node for node_info in found]
+
+
 def create_error_from_node(node, msg, tokens=None, **kwargs) -> Error:
     if tokens is None:
         tokens = node.tokens
@@ -356,8 +472,9 @@ def create_error_from_node(node, msg, tokens=None, **kwargs) -> Error:
 def print_ast(node, stream=None):
     if stream is None:
         stream = sys.stderr
-    errors_visitor = _PrinterVisitor(stream)
-    errors_visitor.visit(node)
+    printer_visitor = _PrinterVisitor()
+    printer_visitor.visit(node)
+    printer_visitor.write_to(stream)
 
 
 def iter_sections(node):
@@ -459,15 +576,70 @@ def matches_stack(
 
             # Not directly the same (we could be inside some for/while, so, let's
             # see if we can get the keyword/testcase from the stack).
-            _, node1 = get_local_variable_stack_and_node(stack)
-            _, node2 = get_local_variable_stack_and_node(def_stack)
-            return node1.lineno == node2.lineno
+            return _get_local_node_lineno(stack) == _get_local_node_lineno(def_stack)
 
     return True
 
 
-def _iter_nodes(
-    node, internal_stack: Optional[List[INode]] = None, recursive=True
+def _get_local_node_lineno(stack: Sequence[INode]) -> int:
+    """
+    Provides the lineno of the node which `get_local_variable_stack_and_node`
+    would return (without creating the local stack).
+    """
+    for local_stack_node in reversed(stack):
+        if local_stack_node.__class__.__name__ in ("Keyword", "TestCase"):
+            return local_stack_node.lineno
+    return stack[0].lineno
+
+
+# Fields which never have child nodes (the statement tokens and type).
+_LEAF_FIELDS = frozenset(("type", "tokens"))
+
+_node_class_to_child_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+def _get_child_fields(node_class: type) -> Tuple[str, ...]:
+    """
+    Provides the fields of the given node class which may have child nodes.
+    """
+    child_fields = _node_class_to_child_fields.get(node_class)
+    if child_fields is None:
+        child_fields = _node_class_to_child_fields[node_class] = tuple(
+            field for field in node_class._fields if field not in _LEAF_FIELDS
+        )
+    return child_fields
+
+
+def _get_child_nodes(node) -> List[INode]:
+    """
+    Provides the direct children of the given node.
+
+    :note: the fields are accessed directly (instead of using
+    `ast.iter_fields`, which creates a generator for each node).
+    """
+    children: List[INode] = []
+    for field in _get_child_fields(type(node)):
+        value = getattr(node, field, None)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, _AST_CLASS):
+                    children.append(item)
+
+        elif isinstance(value, _AST_CLASS):
+            children.append(value)
+    return children
+
+
+def _get_initial_stack(node) -> List[INode]:
+    if node.__class__.__name__ == "File":
+        return []
+    return [node]
+
+
+def _iter_nodes_recursive(
+    node, internal_stack: Optional[List[INode]] = None
 ) -> Iterator[Tuple[List[INode], INode]]:
     """
     :note: the yielded stack is actually always the same (mutable) list, so,
@@ -475,39 +647,80 @@ def _iter_nodes(
     """
     stack: List[INode]
     if internal_stack is None:
-        stack = []
-        if node.__class__.__name__ != "File":
-            stack.append(node)
+        stack = _get_initial_stack(node)
     else:
         stack = internal_stack
 
-    if recursive:
-        for _field, value in ast_module.iter_fields(node):
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, _AST_CLASS):
-                        yield stack, item
-                        stack.append(item)
-                        yield from _iter_nodes(item, stack, recursive=True)
-                        stack.pop()
+    # Iterative traversal: one iterator over the children of each node in
+    # the stack (the first one is for the children of `node`, which may not
+    # be in the stack).
+    children_iterators = [iter(_get_child_nodes(node))]
+    while children_iterators:
+        child = next(children_iterators[-1], None)
+        if child is None:
+            children_iterators.pop()
+            if children_iterators:
+                stack.pop()
+            continue
 
-            elif isinstance(value, _AST_CLASS):
-                yield stack, value
-                stack.append(value)
+        yield stack, child
+        stack.append(child)
+        children_iterators.append(iter(_get_child_nodes(child)))
 
-                yield from _iter_nodes(value, stack, recursive=True)
 
-                stack.pop()
+def _iter_nodes_recursive_with_stack_tuple(
+    node,
+) -> Iterator[Tuple[Tuple[INode, ...], INode]]:
+    """
+    Same as `_iter_nodes_recursive` but the stack is provided as a tuple which
+    is shared among siblings (so, clients don't need to create a copy for
+    each node and it's only created for nodes which actually have children).
+    """
+    get_child_nodes = _get_child_nodes
+    pending = [(tuple(_get_initial_stack(node)), iter(get_child_nodes(node)))]
+    while pending:
+        stack_tuple, children = pending[-1]
+        child = next(children, None)
+        if child is None:
+            pending.pop()
+            continue
+
+        yield stack_tuple, child
+        grandchildren = get_child_nodes(child)
+        if grandchildren:
+            pending.append((stack_tuple + (child,), iter(grandchildren)))
+
+
+def _iter_nodes_not_recursive(
+    node, internal_stack: Optional[List[INode]] = None
+) -> Iterator[Tuple[List[INode], INode]]:
+    """
+    Provides the direct children of the given node (the stack is the same for
+    all of those).
+    """
+    stack: List[INode]
+    if internal_stack is None:
+        stack = _get_initial_stack(node)
     else:
-        # Not recursive
-        for _field, value in ast_module.iter_fields(node):
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, _AST_CLASS):
-                        yield stack, item
+        stack = internal_stack
+
+    for child in _get_child_nodes(node):
+        yield stack, child
+
+
+def _iter_nodes(
+    node, internal_stack: Optional[List[INode]] = None, recursive=True
+) -> Iterator[Tuple[List[INode], INode]]:
+    """
+    :note: the yielded stack is actually always the same (mutable) list, so,
+    clients that want to return it somewhere else should create a copy.
 
-            elif isinstance(value, _AST_CLASS):
-                yield stack, value
+    :note: prefer using `_iter_nodes_recursive` or `_iter_nodes_not_recursive`
+    directly when `recursive` is known beforehand.
+    """
+    if recursive:
+        return _iter_nodes_recursive(node, internal_stack)
+    return _iter_nodes_not_recursive(node, internal_stack)
 
 
 def _iter_nodes_reverse(node) -> Iterator[INode]:
@@ -537,7 +750,7 @@ def iter_all_nodes_recursive(node: INode) -> Iterator[Tuple[List[INode], INode]]
     This function will iterate over all the nodes. Use only if there's no
     other way to implement it as iterating over all the nodes is slow...
     """
-    yield from _iter_nodes(node)
+    yield from _iter_nodes_recursive(node)
 
 
 def _iter_nodes_filtered_not_recursive(
@@ -545,42 +758,67 @@ def _iter_nodes_filtered_not_recursive(
 ) -> Iterator[Tuple[list, Any]]:
     if not isinstance(accept_class, (list, tuple, set)):
         accept_class = (accept_class,)
-    for stack, node in _iter_nodes(ast, recursive=False):
-        if node.__class__.__name__ in accept_class:
+    for stack, node in _iter_nodes_not_recursive(ast):
+        if type(node).__name__ in accept_class:
             yield stack, node
 
 
-def find_token(section, line, col) -> Optional[TokenInfo]:
+def _compute_line_to_nodes_and_tokens(
+    indexer: _ASTIndexer,
+) -> Dict[int, List[Tuple[Tuple[INode, ...], INode, List[IRobotToken]]]]:
     """
-    :param section:
-        The result from find_section(line, col), to pre-filter the nodes we may match.
+    :return: a dict with the 0-based line -> list(stack, node, tokens in line)
+    (in the same order in which the nodes/tokens are found when iterating).
     """
-    for stack, node in _iter_nodes(section):
-        try:
-            tokens = node.tokens
-        except AttributeError:
-            continue
-
+    line_to_nodes_and_tokens: Dict[
+        int, List[Tuple[Tuple[INode, ...], INode, List[IRobotToken]]]
+    ] = {}
+    ast = indexer.ast
+    if ast is None:
+        raise RuntimeError("AST already garbage collected.")
+
+    for stack, node in _iter_nodes_recursive(ast):
+        tokens = getattr(node, "tokens", None)
         if not tokens:
             continue
 
-        if (tokens[-1].lineno - 1) < line:
-            # i.e.: if the last node in the token is still before the
-            # line we're searching, keep on going
-            continue
-
-        last_token = None
+        stack_tuple = tuple(stack)
+        line_to_tokens: Dict[int, List[IRobotToken]] = {}
         for token in tokens:
             lineno = token.lineno - 1
-            if lineno != line:
-                continue
+            line_tokens = line_to_tokens.get(lineno)
+            if line_tokens is None:
+                line_tokens = line_to_tokens[lineno] = []
+                line_to_nodes_and_tokens.setdefault(lineno, []).append(
+                    (stack_tuple, node, line_tokens)
+                )
+            line_tokens.append(token)
+
+    return line_to_nodes_and_tokens
+
+
+def find_token(section, line, col) -> Optional[TokenInfo]:
+    """
+    :param section:
+        The result from find_section(line, col), to pre-filter the nodes we may match.
+
+    :note: the tokens are indexed by line (for the section) in the first call,
+    so, subsequent calls just check the tokens in the given line.
+    """
+    indexer = _obtain_ast_indexer(section)
+    line_to_nodes_and_tokens = indexer.get_cached_value(
+        "find_token", _compute_line_to_nodes_and_tokens
+    )
 
+    for stack, node, tokens in line_to_nodes_and_tokens.get(line, ()):
+        last_token = None
+        for token in tokens:
             if token.type == token.SEPARATOR:
                 # For separator tokens, it must be entirely within the section
                 # i.e.: if it's in the boundary for a word, we want the word,
                 # not the separator.
                 if token.col_offset < col < token.end_col_offset:
-                    return TokenInfo(tuple(stack), node, token)
+                    return TokenInfo(stack, node, token)
 
             elif token.type == token.EOL:
                 # A trailing whitespace after a keyword should be part of
@@ -592,11 +830,11 @@ def find_token(section, line, col) -> Optional[TokenInfo]:
                         if len(eol_contents) <= 1:
                             token = _append_eol_to_prev_token(last_token, eol_contents)
 
-                    return TokenInfo(tuple(stack), node, token)
+                    return TokenInfo(stack, node, token)
 
             else:
                 if token.col_offset <= col <= token.end_col_offset:
-                    return TokenInfo(tuple(stack), node, token)
+                    return TokenInfo(stack, node, token)
 
             last_token = token
 
@@ -709,10 +947,20 @@ def tokenize_variables_from_name(name):
 
 
 def tokenize_variables(token: IRobotToken) -> Iterator[IRobotToken]:
+    if "{" not in token.value:
+        # Fast path: no variables (RF would just provide the token itself).
+        return iter((token,))
+
     # May throw error if it's not OK.
     return iter(tuple(token.tokenize_variables()))
 
 
+# Matches the part of a variable after the cursor for
+# `_tokenize_variables_even_when_invalid` (stops at a variable prefix,
+# a space or a `{` and includes the closing `}`).
+_VARIABLE_REST_AFTER_CURSOR_RE = re.compile(r"[^@%$&\s{}]*\}?")
+
+
 def _tokenize_variables_even_when_invalid(
     token: IRobotToken, col: int
 ) -> Iterator[IRobotToken]:
@@ -733,27 +981,24 @@ def _tokenize_variables_even_when_invalid(
     from robotframework_ls.impl.robot_constants import VARIABLE_PREFIXES
 
     diff = col - token.col_offset
-    up_to_cursor = token.value[:diff]
+    value = token.value
+    up_to_cursor = value[:diff]
     open_at = up_to_cursor.rfind("{")
 
     if open_at >= 1:
         if up_to_cursor[open_at - 1] in VARIABLE_PREFIXES:
-            varname = [up_to_cursor[open_at - 1 :]]
-            from_cursor = token.value[diff:]
-
-            for c in from_cursor:
-                if c in VARIABLE_PREFIXES or c.isspace() or c == "{":
-                    break
-                if c == "}":
-                    varname.append(c)
-                    break
-                varname.append(c)
+            # The variable goes up to the cursor and then up to the closing
+            # `}` (or until something which can't be in the variable name).
+            after_cursor = _VARIABLE_REST_AFTER_CURSOR_RE.match(value, diff)
+            varname = up_to_cursor[open_at - 1 :]
+            if after_cursor is not None:
+                varname += after_cursor.group(0)
 
             return iter(
                 [
                     Token(
                         type=token.VARIABLE,
-                        value="".join(varname),
+                        value=varname,
                         lineno=token.lineno,
                         col_offset=token.col_offset + open_at - 1,
                         error=token.error,
@@ -767,6 +1012,12 @@ LIBRARY_IMPORT_CLASSES = ("LibraryImport",)
 RESOURCE_IMPORT_CLASSES = ("ResourceImport",)
 SETTING_SECTION_CLASSES = ("SettingSection",)
 
+# Used in the is_*_node_info checks (a single string comparison instead of
+# a containment check in a tuple).
+_LIBRARY_IMPORT_CLASS = LIBRARY_IMPORT_CLASSES[0]
+_RESOURCE_IMPORT_CLASS = RESOURCE_IMPORT_CLASSES[0]
+_SETTING_SECTION_CLASS = SETTING_SECTION_CLASSES[0]
+
 
 @_convert_ast_to_indexer
 def iter_nodes(ast, accept_class: Union[Tuple[str, ...], str]) -> Iterator[NodeInfo]:
@@ -788,26 +1039,33 @@ def iter_all_nodes(ast, recursive=True) -> Iterator[NodeInfo]:
     Use one of the filtered APIs whenever possible as those are cached
     by the type.
     """
-    for stack, node in _iter_nodes(ast, recursive=recursive):
-        yield NodeInfo(tuple(stack), node)
+    if recursive:
+        for stack_tuple, node in _iter_nodes_recursive_with_stack_tuple(ast):
+            yield NodeInfo(stack_tuple, node)
+    else:
+        stack_tuple = None
+        for stack, node in _iter_nodes_not_recursive(ast):
+            if stack_tuple is None:
+                stack_tuple = tuple(stack)
+            yield NodeInfo(stack_tuple, node)
 
 
 def is_library_node_info(node_info: NodeInfo) -> bool:
-    return node_info.node.__class__.__name__ in LIBRARY_IMPORT_CLASSES
+    return type(node_info.node).__name__ == _LIBRARY_IMPORT_CLASS
 
 
 def is_resource_node_info(node_info: NodeInfo) -> bool:
-    return node_info.node.__class__.__name__ in RESOURCE_IMPORT_CLASSES
+    return type(node_info.node).__name__ == _RESOURCE_IMPORT_CLASS
 
 
 def is_setting_section_node_info(node_info: NodeInfo) -> bool:
-    return node_info.node.__class__.__name__ in SETTING_SECTION_CLASSES
+    return type(node_info.node).__name__ == _SETTING_SECTION_CLASS
 
 
 @_convert_ast_to_indexer
 def iter_library_imports(ast) -> Iterator[NodeInfo[ILibraryImportNode]]:
     cache_key = "iter_library_imports"
-    yield from ast.iter_cached(cache_key, _iter_library_imports_uncached)
+    yield from ast.get_cached(cache_key, _iter_library_imports_uncached)
 
 
 def _iter_library_imports_uncached(ast):
@@ -857,44 +1115,36 @@ def _iter_library_imports_uncached(ast):
                 yield NodeInfo(keyword_usage_info.stack, node)
 
 
-@_convert_ast_to_indexer
 def iter_resource_imports(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("ResourceImport")
+    return _get_indexer(ast).iter_indexed("ResourceImport")
 
 
-@_convert_ast_to_indexer
 def iter_variable_imports(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("VariablesImport")
+    return _get_indexer(ast).iter_indexed("VariablesImport")
 
 
-@_convert_ast_to_indexer
 def iter_keywords(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("Keyword")
+    return _get_indexer(ast).iter_indexed("Keyword")
 
 
-@_convert_ast_to_indexer
 def iter_variables(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("Variable")
+    return _get_indexer(ast).iter_indexed("Variable")
 
 
-@_convert_ast_to_indexer
 def iter_tests(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("TestCase")
+    return _get_indexer(ast).iter_indexed("TestCase")
 
 
-@_convert_ast_to_indexer
 def iter_test_case_sections(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("TestCaseSection")
+    return _get_indexer(ast).iter_indexed("TestCaseSection")
 
 
-@_convert_ast_to_indexer
 def iter_setting_sections(ast) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed("SettingSection")
+    return _get_indexer(ast).iter_indexed("SettingSection")
 
 
-@_convert_ast_to_indexer
 def iter_indexed(ast, clsname) -> Iterator[NodeInfo]:
-    yield from ast.iter_indexed(clsname)
+    return _get_indexer(ast).iter_indexed(clsname)
 
 
 def iter_keyword_arguments_as_str(ast, tokenize_keyword_name=False) -> Iterator[str]:
@@ -1005,23 +1255,32 @@ def is_deprecated(ast) -> bool:
     return has_deprecated_text(docs)
 
 
-def get_documentation_raw(ast: INode) -> str:
-    iter_in: Iterator[INode]
+def _iter_documentation_nodes_by_section(ast: INode) -> Iterator[Iterator[INode]]:
     if ast.__class__.__name__ == "File":
         # Handle the case where the File is given (docs must be gotten from
-        # the *** Settings *** in this case).
-        iter_in = (node_info.node for node_info in iter_setting_sections(ast))
+        # the *** Settings *** in this case). Note: the setting sections are
+        # indexed (and cached) as they're also used to get the imports.
+        for section_node_info in iter_setting_sections(ast):
+            yield (
+                node_info.node
+                for node_info in iter_indexed(section_node_info.node, "Documentation")
+            )
     else:
-        iter_in = iter((ast,))
+        yield (
+            node
+            for _stack, node in _iter_nodes_filtered_not_recursive(
+                ast, accept_class="Documentation"
+            )
+        )
+
 
+def get_documentation_raw(ast: INode) -> str:
     doc: List[str] = []
     last_line: List[str] = []
 
     last_token = None
-    for ast_node in iter_in:
-        for _stack, node in _iter_nodes_filtered_not_recursive(
-            ast_node, accept_class="Documentation"
-        ):
+    for documentation_nodes in _iter_documentation_nodes_by_section(ast):
+        for node in documentation_nodes:
             for token in node.tokens:
                 if last_token is not None and last_token.lineno != token.lineno:
                     doc.extend(last_line)
@@ -1071,6 +1330,10 @@ KEYWORD_SET_GLOBAL_TO_VAR_KIND = {
     normalize_robot_name("Set Global Variable"): VariableKind.GLOBAL_SET_VARIABLE,
 }
 
+_STORE_KEYWORDS = frozenset(KEYWORD_SET_LOCAL_TO_VAR_KIND) | frozenset(
+    KEYWORD_SET_GLOBAL_TO_VAR_KIND
+)
+
 
 KEYWORD_SET_ENV_TO_VAR_KIND = {
     normalize_robot_name("Set Environment Variable"): VariableKind.ENV_SET_VARIABLE,
@@ -1097,18 +1360,23 @@ def iter_local_assigns(ast) -> Iterator[VarTokenInfo]:
                     value = token.value
 
                     i = value.find("{")
+                    if i < 1:
+                        continue
+
                     j = value.rfind("}")
-                    if i != -1 and j != -1 and i >= 1:
-                        new_value = value[i + 1 : j]
-                        token = Token(
-                            type=token.type,
-                            value=new_value,
-                            lineno=token.lineno,
-                            col_offset=token.col_offset + i + 1,
-                            error=token.error,
-                        )
+                    if j == -1:
+                        continue
+
+                    new_value = value[i + 1 : j]
+                    token = Token(
+                        type=token.type,
+                        value=new_value,
+                        lineno=token.lineno,
+                        col_offset=token.col_offset + i + 1,
+                        error=token.error,
+                    )
 
-                        yield VarTokenInfo(node_info.stack, node, token, value[0])
+                    yield VarTokenInfo(node_info.stack, node, token, value[0])
 
 
 _FIXTURE_CLASS_NAMES = (
@@ -1133,6 +1401,30 @@ CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET = frozenset(
     _CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_TUPLE
 )
 
+_CLASSES_KEYWORDS_AND_OTHERS_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET = frozenset(
+    _CLASSES_KEYWORDS_AND_OTHERS_WITH_ARGUMENTS_AS_KEYWORD_CALLS
+)
+
+# Class name of the nodes with keyword usages -> type of the keyword name token.
+CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE: Dict[str, str] = {
+    "KeywordCall": robot_constants.KEYWORD,
+}
+CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE.update(
+    (clsname, robot_constants.NAME)
+    for clsname in _CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_TUPLE
+)
+
+_CLASSES_WITH_VARIABLE_REFERENCES = (
+    "KeywordCall",
+    "LibraryImport",
+    "ResourceImport",
+    "TestTimeout",
+    "Variable",
+    "ForHeader",  # RF 4+
+    "ForLoopHeader",  # RF 3
+    "ReturnStatement",  # RF 5
+) + _FIXTURE_CLASS_NAMES
+
 CLASSES_WTH_EXPRESSION_ARGUMENTS = (
     "IfHeader",
     "ElseIfHeader",
@@ -1140,6 +1432,8 @@ CLASSES_WTH_EXPRESSION_ARGUMENTS = (
     "InlineIfHeader",
 )
 
+_CLASSES_WTH_EXPRESSION_ARGUMENTS_AS_SET = frozenset(CLASSES_WTH_EXPRESSION_ARGUMENTS)
+
 
 def _tokenize_subvars(
     initial_token: IRobotToken,
@@ -1201,19 +1495,17 @@ def _is_store_keyword(node):
     keyword_name_tok = node.get_token(Token.KEYWORD)
     if not keyword_name_tok:
         return False
-    normalized = normalize_robot_name(keyword_name_tok.value)
-    return (
-        normalized in KEYWORD_SET_LOCAL_TO_VAR_KIND
-        or normalized in KEYWORD_SET_GLOBAL_TO_VAR_KIND
-    )
+    return normalize_robot_name(keyword_name_tok.value) in _STORE_KEYWORDS
 
 
-def _add_match(found: set, tok: IRobotToken) -> bool:
+def _add_match(found: Set[int], tok: IRobotToken) -> bool:
     """
     Helper to avoid returning 2 matches in the same position if 2 different
     heuristics overlap what they can return.
     """
-    key = tok.col_offset, tok.lineno
+    # Note: the position is packed in an int (instead of a tuple) to
+    # avoid an allocation for each match.
+    key = (tok.lineno << 32) + tok.col_offset
     if key in found:
         return False
     found.add(key)
@@ -1222,28 +1514,23 @@ def _add_match(found: set, tok: IRobotToken) -> bool:
 
 @_convert_ast_to_indexer
 def iter_variable_references(ast) -> Iterator[VarTokenInfo]:
-    from robotframework_ls.impl.ast_utils_keyword_usage import (
-        obtain_keyword_usage_handler,
-    )
-
     # TODO: This right now makes everything globally, we should have 2 versions,
     # one to resolve references which are global and another to resolve references
     # just inside some scope when dealing with local variables.
     # Right now we're not very smart and even if a variable is local we'll reference
     # global variables...
 
+    from robot.api import Token
+
+    # Note: token types bound to locals as this is a hot loop.
+    ARGUMENT = Token.ARGUMENT
+    NAME = Token.NAME
+    KEYWORD = Token.KEYWORD
+    VARIABLE = Token.VARIABLE
+
     # Note: we collect only the references, not the definitions here!
-    found: set = set()
-    for clsname in (
-        "KeywordCall",
-        "LibraryImport",
-        "ResourceImport",
-        "TestTimeout",
-        "Variable",
-        "ForHeader",  # RF 4+
-        "ForLoopHeader",  # RF 3
-        "ReturnStatement",  # RF 5
-    ) + _FIXTURE_CLASS_NAMES:
+    found: Set[int] = set()
+    for clsname in _CLASSES_WITH_VARIABLE_REFERENCES:
         for node_info in ast.iter_indexed(clsname):
             stack = node_info.stack
             node = node_info.node
@@ -1251,55 +1538,66 @@ def iter_variable_references(ast) -> Iterator[VarTokenInfo]:
             arg_i = 0
             for token in node.tokens:
                 try:
-                    if token.type == token.ARGUMENT:
+                    token_type = token.type
+                    if token_type == ARGUMENT:
                         arg_i += 1
                         if arg_i == 1 and clsname == "KeywordCall":
                             if _is_store_keyword(node_info.node):
                                 continue
 
-                    if token.type == token.KEYWORD:
+                    elif token_type != NAME and token_type != KEYWORD:
+                        continue
+
+                    if "{" not in token.value:
+                        # i.e.: there's no variable (fast path to skip the
+                        # tokenization).
+                        continue
+
+                    if token_type == KEYWORD:
                         # Keyword calls may also have variables (unfortunately
                         # RF doesn't tokenize it with that type, so, we have
                         # to apply a workaround to change the type).
-                        token = copy_token_replacing(token, type=token.NAME)
-
-                    if token.type in (token.ARGUMENT, token.NAME):
-                        for tok in tokenize_variables(token):
-                            if tok.type == token.VARIABLE:
-                                # We need to check for inner variables (as in
-                                # this case we validate those).
-                                for t, var_info in _tokenize_subvars(tok):
-                                    if t.type != token.VARIABLE:
-                                        continue
-                                    if not _add_match(found, t):
-                                        continue
+                        token = copy_token_replacing(token, type=NAME)
+
+                    for tok in tokenize_variables(token):
+                        if tok.type == VARIABLE:
+                            # We need to check for inner variables (as in
+                            # this case we validate those).
+                            for t, var_info in _tokenize_subvars(tok):
+                                if t.type != VARIABLE:
+                                    continue
+                                if not _add_match(found, t):
+                                    continue
 
-                                    yield VarTokenInfo(stack, node, t, var_info)
+                                yield VarTokenInfo(stack, node, t, var_info)
 
                 except:
                     log.exception("Unable to tokenize: %s", token)
 
-    for node_info in _iter_node_info_which_may_have_usage_info(ast):
-        stack = node_info.stack
-        node = node_info.node
-        keyword_usage_handler = obtain_keyword_usage_handler(stack, node)
-        if keyword_usage_handler is not None:
-            for usage_info in keyword_usage_handler.iter_keyword_usages_from_node():
-                arg_i = 0
-                for token in usage_info.node.tokens:
-                    if token.type == token.ARGUMENT:
-                        arg_i += 1
-                        if arg_i == 1:
-                            if _is_store_keyword(usage_info.node):
-                                continue
+    for keyword_usage_handler in _get_keyword_usage_handlers(ast, True):
+        if not keyword_usage_handler.has_token_type(keyword_usage_handler.EXPRESSION):
+            # i.e.: Only the expressions are handled here (the other arguments
+            # were already handled in the loop above).
+            continue
 
-                        next_tok_type = keyword_usage_handler.get_token_type(token)
-                        if next_tok_type == keyword_usage_handler.EXPRESSION:
-                            for tok, var_info in iter_expression_variables(token):
-                                if tok.type == token.VARIABLE:
-                                    if not _add_match(found, tok):
-                                        continue
-                                    yield VarTokenInfo(stack, node, tok, var_info)
+        stack = keyword_usage_handler.stack
+        node = keyword_usage_handler.node
+        for usage_info in keyword_usage_handler.iter_keyword_usages_from_node():
+            arg_i = 0
+            for token in usage_info.node.tokens:
+                if token.type == token.ARGUMENT:
+                    arg_i += 1
+                    if arg_i == 1:
+                        if _is_store_keyword(usage_info.node):
+                            continue
+
+                    next_tok_type = keyword_usage_handler.get_token_type(token)
+                    if next_tok_type == keyword_usage_handler.EXPRESSION:
+                        for tok, var_info in iter_expression_variables(token):
+                            if tok.type == token.VARIABLE:
+                                if not _add_match(found, tok):
+                                    continue
+                                yield VarTokenInfo(stack, node, tok, var_info)
 
     for clsname in CLASSES_WTH_EXPRESSION_ARGUMENTS:
         for node_info in ast.iter_indexed(clsname):
@@ -1356,7 +1654,7 @@ def iter_keyword_usage_tokens(
     """
 
     cache_key = ("iter_keyword_usage_tokens", collect_args_as_keywords)
-    yield from ast.iter_cached(
+    yield from ast.get_cached(
         cache_key, _iter_keyword_usage_tokens_uncached, collect_args_as_keywords
     )
 
@@ -1368,7 +1666,7 @@ def _same_line_col(tok1: IRobotToken, tok2: IRobotToken):
 def is_keyword_usage_node(ast):
     return (
         ast.__class__.__name__
-        in _CLASSES_KEYWORDS_AND_OTHERS_WITH_ARGUMENTS_AS_KEYWORD_CALLS
+        in _CLASSES_KEYWORDS_AND_OTHERS_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET
     )
 
 
@@ -1381,18 +1679,73 @@ def _iter_node_info_which_may_have_usage_info(ast):
 def _iter_keyword_usage_tokens_uncached(
     ast, collect_args_as_keywords: bool
 ) -> Iterator[KeywordUsageInfo]:
+    for keyword_usage_handler in _get_keyword_usage_handlers(
+        ast, collect_args_as_keywords
+    ):
+        yield from keyword_usage_handler.iter_keyword_usages_from_node()
+
+
+def _get_keyword_usage_handlers(ast, recursive: bool) -> tuple:
+    """
+    Provides the keyword usage handlers for the nodes which may have keyword
+    usages (cached in the indexer so that the keyword usages and the arguments
+    as keywords are computed only once per ast).
+    """
+    return ast.get_cached(
+        ("keyword_usage_handlers", recursive),
+        _iter_keyword_usage_handlers_uncached,
+        recursive,
+    )
+
+
+def get_cached_keyword_usage_handler(root, stack, node, recursive: bool):
+    """
+    :param root:
+        The ast (or indexer) which contains the given node.
+
+    :return: the keyword usage handler previously computed for the given
+    node/stack in the root or None if it's not available.
+    """
+    node_id_to_handler = _get_indexer(root).get_cached_value(
+        ("node_id_to_keyword_usage_handler", recursive),
+        _compute_node_id_to_keyword_usage_handler,
+        recursive,
+    )
+    keyword_usage_handler = node_id_to_handler.get(id(node))
+    if keyword_usage_handler is None or keyword_usage_handler.node is not node:
+        return None
+
+    if keyword_usage_handler.stack != tuple(stack):
+        return None
+    return keyword_usage_handler
+
+
+def _compute_node_id_to_keyword_usage_handler(ast, recursive: bool) -> dict:
+    # Note: the handler keeps the node alive (so, the id can't be reused).
+    return dict(
+        (id(keyword_usage_handler.node), keyword_usage_handler)
+        for keyword_usage_handler in _get_keyword_usage_handlers(ast, recursive)
+    )
+
+
+def _iter_keyword_usage_handlers_uncached(ast, recursive: bool):
     from robotframework_ls.impl.ast_utils_keyword_usage import (
         obtain_keyword_usage_handler,
     )
 
+    root = ast.ast
     for node_info in _iter_node_info_which_may_have_usage_info(ast):
         stack = node_info.stack
-        node = node_info.node
         keyword_usage_handler = obtain_keyword_usage_handler(
-            stack, node, recursive=collect_args_as_keywords
+            stack,
+            node_info.node,
+            recursive=recursive,
+            # i.e.: When indexing a File the handlers are shared with the
+            # ones cached in the sections (which are at stack[0]).
+            use_cache=bool(stack) and stack[0] is not root,
         )
         if keyword_usage_handler is not None:
-            yield from keyword_usage_handler.iter_keyword_usages_from_node()
+            yield keyword_usage_handler
 
 
 def create_keyword_usage_info_from_token(
@@ -1582,8 +1935,30 @@ def _strip_token_bdd_prefix(
 
     assert token is not None
 
-    text = token.value.lower()
-    for prefix in locinfo.iter_bdd_prefixes_on_read():
+    prefix = _get_bdd_prefix(token.value, locinfo.get_bdd_prefixes_on_read())
+    if not prefix:
+        return "", token
+
+    new_name = token.value[len(prefix) + 1 :]
+    return prefix, Token(
+        type=token.type,
+        value=new_name,
+        lineno=token.lineno,
+        col_offset=token.col_offset + len(prefix) + 1,
+        error=token.error,
+    )
+
+
+@lru_cache(4096)
+def _get_bdd_prefix(value: str, bdd_prefixes: FrozenSet[str]) -> str:
+    """
+    :return: the bdd prefix (followed by a space) found in the given value or
+    an empty string if there's no bdd prefix.
+
+    Note: keyword names repeat a lot, so, the result is cached.
+    """
+    text = value.lower()
+    for prefix in bdd_prefixes:
         if text.startswith(prefix):
             try:
                 next_is_space = text[len(prefix)] == " "
@@ -1591,15 +1966,8 @@ def _strip_token_bdd_prefix(
                 continue
 
             if next_is_space:
-                new_name = token.value[len(prefix) + 1 :]
-                return prefix, Token(
-                    type=token.type,
-                    value=new_name,
-                    lineno=token.lineno,
-                    col_offset=token.col_offset + len(prefix) + 1,
-                    error=token.error,
-                )
-    return "", token
+                return prefix
+    return ""
 
 
 def _append_eol_to_prev_token(last_token, eol_token_contents):
@@ -1677,7 +2045,7 @@ def create_range_from_node(node: INode, accept_empty=True) -> Optional[RangeType
 
     # Find the first token
     for n in itertools.chain(
-        iter((node,)), (x[1] for x in _iter_nodes(node, recursive=True))
+        iter((node,)), (x[1] for x in _iter_nodes_recursive(node))
     ):
         try:
             last_found_tokens = n.tokens
@@ -1746,21 +2114,24 @@ def convert_variable_match_base_to_token(
 
     base = variable_match.base
     assert base is not None
-    s = variable_match.string
-    if not base:
-        base_i = s.find("{") + 1
-    else:
-        base_i = s.find(base)
 
     return Token(
         type=token.type,
-        value=variable_match.base,
+        value=base,
         lineno=token.lineno,
-        col_offset=token.col_offset + variable_match.start + base_i,
+        col_offset=token.col_offset + _get_variable_match_base_index(variable_match),
         error=token.error,
     )
 
 
+def _get_variable_match_base_index(variable_match: IRobotVariableMatch) -> int:
+    """
+    :return: the index of the base in the variable match string (the base
+    starts right after the identifier and the `{`, so, no search is needed).
+    """
+    return variable_match.start + len(variable_match.identifier) + 1
+
+
 def iter_robot_match_as_tokens(
     robot_match: IRobotVariableMatch, relative_index: int = 0, lineno: int = 0
 ) -> Iterator[IRobotToken]:
@@ -1769,16 +2140,17 @@ def iter_robot_match_as_tokens(
     base = robot_match.base
     assert base is not None
     s = robot_match.string
-    if not base:
-        base_i = s.find("{") + 1
-    else:
-        base_i = s.find(base)
+    base_i = _get_variable_match_base_index(robot_match)
 
+    # Note: the items are searched with a cursor which is always moved
+    # forward (and in the common case the item and the closing bracket are
+    # right at the cursor position, so, no search is needed).
+    col_offset = relative_index
     yield Token(
         type="base",
         value=base,
         lineno=lineno,
-        col_offset=relative_index + robot_match.start + base_i,
+        col_offset=col_offset + base_i,
     )
 
     last_i = base_i + len(base)
@@ -1789,12 +2161,12 @@ def iter_robot_match_as_tokens(
                 type="[",
                 value="[",
                 lineno=lineno,
-                col_offset=relative_index + robot_match.start + open_char_i,
+                col_offset=col_offset + open_char_i,
             )
 
             last_i = open_char_i + 1
 
-        if not item:
+        if not item or s.startswith(item, last_i):
             item_i = last_i
         else:
             item_i = s.find(item, last_i)
@@ -1803,20 +2175,23 @@ def iter_robot_match_as_tokens(
             type="item",
             value=item,
             lineno=lineno,
-            col_offset=relative_index + robot_match.start + item_i,
+            col_offset=col_offset + item_i,
         )
 
         last_i = item_i + len(item)
 
-        close_char_i = s.find("]", last_i)
-        if close_char_i < 0:
-            break
+        if s.startswith("]", last_i):
+            close_char_i = last_i
+        else:
+            close_char_i = s.find("]", last_i)
+            if close_char_i < 0:
+                break
 
         yield Token(
             type="]",
             value="]",
             lineno=lineno,
-            col_offset=relative_index + robot_match.start + close_char_i,
+            col_offset=col_offset + close_char_i,
         )
 
         last_i = close_char_i
@@ -1830,23 +2205,25 @@ def split_token_in_3(
     start_pos,
     end_pos,
 ) -> Tuple[IRobotToken, IRobotToken, IRobotToken]:
-    first = copy_token_replacing(
-        token,
-        type=first_token_type,
-        value=token.value[:start_pos],
-    )
-    second = copy_token_replacing(
-        token,
-        type=second_token_type,
-        value=token.value[start_pos:end_pos],
-        col_offset=token.col_offset + start_pos,
-    )
+    from robot.api import Token
 
-    third = copy_token_replacing(
-        token,
-        type=third_token_type,
-        value=token.value[end_pos:],
-        col_offset=second.end_col_offset,
+    # Note: Token is created directly (instead of using copy_token_replacing)
+    # as this is used in hot paths.
+    value = token.value
+    lineno = token.lineno
+    error = token.error
+
+    second_value = value[start_pos:end_pos]
+    second_col_offset = token.col_offset + start_pos
+
+    first = Token(first_token_type, value[:start_pos], lineno, token.col_offset, error)
+    second = Token(second_token_type, second_value, lineno, second_col_offset, error)
+    third = Token(
+        third_token_type,
+        value[end_pos:],
+        lineno,
+        second_col_offset + len(second_value),
+        error,
     )
 
     return first, second, third
@@ -1898,14 +2275,20 @@ def iter_expression_variables(
 
 class RobotMatchTokensGenerator:
     def __init__(self, token, default_type: str):
+        from robot.api import Token
+
         self.default_type = default_type
         self.token = token
         self.last_gen_end_offset = 0
 
+        # Note: keep the Token class in the instance (gen_type is called many
+        # times for each token and doing the import on each call is slower).
+        self._token_class = Token
+
     def gen_type(self, op_type: str, until_offset: int):
         token = self.token
         if until_offset > self.last_gen_end_offset:
-            from robot.api import Token
+            Token = self._token_class
 
             val = token.value[self.last_gen_end_offset : until_offset]
             if val.strip():  # Don't generate just for whitespaces.
@@ -1933,7 +2316,6 @@ class RobotMatchTokensGenerator:
         op_type: str = "variableOperator",
         var_type: Optional[str] = None,
     ) -> Iterable[Tuple[IRobotToken, AdditionalVarInfo]]:
-        from robot.api import Token
         from robotframework_ls.impl.variable_resolve import is_number_var
         from robotframework_ls.impl.variable_resolve import is_python_eval_var
         from robotframework_ls.impl.variable_resolve import (
@@ -1941,17 +2323,18 @@ class RobotMatchTokensGenerator:
         )
         from robotframework_ls.impl.variable_resolve import robot_search_variable
 
+        Token = self._token_class
         curr_var_type = var_type
         if curr_var_type is None:
             curr_var_type = Token.VARIABLE
 
         token = self.token
-        if not robot_match.base:
-            i = token.value.find("{", robot_match.start + last_relative_index) + 1
-        else:
-            i = token.value.find(
-                robot_match.base, robot_match.start + last_relative_index
-            )
+        value = token.value
+        lineno = token.lineno
+        col_offset = token.col_offset
+        error = token.error
+
+        i = last_relative_index + _get_variable_match_base_index(robot_match)
 
         start_offset = robot_match.start + last_relative_index
 
@@ -1960,10 +2343,10 @@ class RobotMatchTokensGenerator:
         yield (
             Token(
                 op_type,
-                token.value[robot_match.start + last_relative_index : i],
-                token.lineno,
-                token.col_offset + start_offset,
-                token.error,
+                value[robot_match.start + last_relative_index : i],
+                lineno,
+                col_offset + start_offset,
+                error,
             ),
             AdditionalVarInfo(),
         )
@@ -1987,7 +2370,7 @@ class RobotMatchTokensGenerator:
                     var_name_from_base = var_name_from_base[:-1]
 
         base_or_extended_part = base
-        offset = token.col_offset + i
+        offset = col_offset + i
         if var_name_from_base or not base_or_extended_part.strip():
             if not has_subvar or (
                 first_subvar_match_in_base
@@ -1999,24 +2382,26 @@ class RobotMatchTokensGenerator:
                     Token(
                         Token.VARIABLE,
                         var_name_from_base,
-                        token.lineno,
-                        token.col_offset + i,
-                        token.error,
+                        lineno,
+                        col_offset + i,
+                        error,
                     ),
                     AdditionalVarInfo(
                         robot_match.identifier, extended_part=base_or_extended_part
                     ),
                 )
 
-        if base_or_extended_part.strip():
+        # Note: only create the token to tokenize the sub variables if there's
+        # some variable in the base (this is the common case: `${var}`).
+        if "{" in base_or_extended_part and base_or_extended_part.strip():
             subvar_tokens = tuple(
                 _tokenize_subvars_tokens(
                     Token(
                         curr_var_type,
                         base_or_extended_part,
-                        token.lineno,
+                        lineno,
                         offset,
-                        token.error,
+                        error,
                     ),
                     op_type,
                     var_type,
@@ -2028,9 +2413,17 @@ class RobotMatchTokensGenerator:
         j = i + len(base)
         self.last_gen_end_offset = j
 
+        # The items are usually one after the other (as `[item1][item2]`), so,
+        # just check them at the expected position (and search if not found).
+        items_cursor = j
         for item in robot_match.items:
-            item_index = token.value.find(item, self.last_gen_end_offset)
+            if value.startswith(item, items_cursor + 1):
+                item_index = items_cursor + 1
+            else:
+                item_index = value.find(item, items_cursor)
+
             if item_index >= 0:
+                items_cursor = item_index + len(item) + 1
                 if "{" in item:
                     yield from self.gen_type(op_type, item_index)
 
@@ -2039,9 +2432,9 @@ class RobotMatchTokensGenerator:
                             Token(
                                 Token.VARIABLE,
                                 item,
-                                token.lineno,
-                                token.col_offset + item_index,
-                                token.error,
+                                lineno,
+                                col_offset + item_index,
+                                error,
                             ),
                             op_type,
                             var_type,
@@ -2053,17 +2446,19 @@ class RobotMatchTokensGenerator:
         yield from self.gen_type(op_type, robot_match.end + last_relative_index)
 
 
-def _gen_tokens_in_py_expr(
-    py_expr,
-    expression_token,
-) -> Iterator[Tuple[IRobotToken, AdditionalVarInfo]]:
+@lru_cache(1024)
+def _get_py_expr_vars(py_expr: str) -> Tuple[Tuple[str, int, str, int], ...]:
+    """
+    :return: a tuple with (operator, operator col, var name, var name col)
+    for each `$var` found in the given python expression.
+
+    Note: the tokenization from the python `tokenize` module is slow and the
+    same expressions are analyzed many times, so, the result is cached.
+    """
     from tokenize import generate_tokens, NAME, ERRORTOKEN
     from io import StringIO
-    from robot.api import Token
-
-    var_type = Token.VARIABLE
-    op_type = "variableOperator"
 
+    found = []
     gen_var_token_info = None
     try:
         for token_info in generate_tokens(StringIO(py_expr).readline):
@@ -2072,28 +2467,41 @@ def _gen_tokens_in_py_expr(
 
             elif gen_var_token_info is not None and token_info.type == NAME:
                 if gen_var_token_info.start[1] == token_info.start[1] - 1:
-                    start_offset = gen_var_token_info.start[1]
-
-                    yield Token(
-                        op_type,
-                        gen_var_token_info.string,
-                        expression_token.lineno,
-                        expression_token.col_offset + start_offset,
-                        expression_token.error,
-                    ), AdditionalVarInfo(context=AdditionalVarInfo.CONTEXT_EXPRESSION)
-
-                    yield Token(
-                        var_type,
-                        token_info.string,
-                        expression_token.lineno,
-                        expression_token.col_offset + token_info.start[1],
-                        expression_token.error,
-                    ), AdditionalVarInfo(
-                        "$", context=AdditionalVarInfo.CONTEXT_EXPRESSION
+                    found.append(
+                        (
+                            gen_var_token_info.string,
+                            gen_var_token_info.start[1],
+                            token_info.string,
+                            token_info.start[1],
+                        )
                     )
 
     except:
-        log.exception(f"Unable to evaluate python expression from: {expression_token}")
+        log.exception(f"Unable to evaluate python expression from: {py_expr!r}")
+    return tuple(found)
+
+
+def _gen_tokens_in_py_expr(
+    py_expr,
+    expression_token,
+) -> Iterator[Tuple[IRobotToken, AdditionalVarInfo]]:
+    from robot.api import Token
+
+    var_type = Token.VARIABLE
+    op_type = "variableOperator"
+
+    lineno = expression_token.lineno
+    col_offset = expression_token.col_offset
+    error = expression_token.error
+
+    for op, op_col, var_name, var_name_col in _get_py_expr_vars(py_expr):
+        yield Token(op_type, op, lineno, col_offset + op_col, error), AdditionalVarInfo(
+            context=AdditionalVarInfo.CONTEXT_EXPRESSION
+        )
+
+        yield Token(
+            var_type, var_name, lineno, col_offset + var_name_col, error
+        ), AdditionalVarInfo("$", context=AdditionalVarInfo.CONTEXT_EXPRESSION)
 
 
 def iter_expression_tokens(
@@ -2107,6 +2515,15 @@ def iter_expression_tokens(
     if default_type is None:
         default_type = expression_token.ARGUMENT
 
+    value = expression_token.value
+    if "{" not in value and "$" not in value:
+        # Fast path: no robot variables nor python `$var` references.
+        if value.strip():
+            yield copy_token_replacing(
+                expression_token, type=default_type
+            ), AdditionalVarInfo()
+        return
+
     expression_to_evaluate: List[str] = []
 
     robot_matches_and_relative_index = list(
@@ -2135,47 +2552,46 @@ def iter_expression_tokens(
             )
 
     robot_match_generator = RobotMatchTokensGenerator(expression_token, default_type)
+    col_offset = expression_token.col_offset
+
+    def gen_python_tok(obj):
+        # obj is a tuple(Token/var identifier)
+        tok = obj[0]
+        yield from robot_match_generator.gen_default_type(tok.col_offset - col_offset)
+        yield obj
+        robot_match_generator.last_gen_end_offset = tok.end_col_offset - col_offset
+
+    # Now, let's merge the vars from python and the robot matches so that we
+    # can iterate properly (both are already sorted by the offset, so, a linear
+    # merge is enough).
+    py_i = 0
+    py_len = len(python_toks_and_identifiers)
+    for robot_match, relative_index in robot_matches_and_relative_index:
+        robot_match_offset = relative_index + robot_match.start + col_offset
+        while py_i < py_len:
+            obj = python_toks_and_identifiers[py_i]
+            if obj[0].col_offset > robot_match_offset:
+                break
+            yield from gen_python_tok(obj)
+            py_i += 1
 
-    # Now, let's put the vars from python and the robot matches we have in a
-    # sorted list so that we can iterate properly.
-    from robot.api import Token
-
-    def key(obj):
-        # obj is either a tuple(robot match/relative index) or a tuple(Token/var identifier)
-        if isinstance(obj[0], Token):
-            return obj[0].col_offset
-
-        robot_match: IRobotVariableMatch = obj[0]
-        relative_index = obj[1]
-        return relative_index + robot_match.start + expression_token.col_offset
-
-    lst = sorted(
-        python_toks_and_identifiers + robot_matches_and_relative_index, key=key
-    )
+        yield from robot_match_generator.gen_tokens_from_robot_match(
+            robot_match, relative_index
+        )
 
-    # obj is either a tuple(robot match/relative index) or a tuple(Token/var identifier)
-    obj: Any
-    for obj in lst:
-        if isinstance(obj[0], Token):
-            yield from robot_match_generator.gen_default_type(
-                obj[0].col_offset - expression_token.col_offset
-            )
-            yield obj
-            robot_match_generator.last_gen_end_offset = (
-                obj[0].end_col_offset - expression_token.col_offset
-            )
+    for obj in python_toks_and_identifiers[py_i:]:
+        yield from gen_python_tok(obj)
 
-        else:
-            yield from robot_match_generator.gen_tokens_from_robot_match(*obj)
     yield from robot_match_generator.gen_default_type(len(expression_token.value))
 
 
 def is_node_with_expression_argument(node) -> bool:
-    if node.__class__.__name__ == "KeywordCall":
+    clsname = node.__class__.__name__
+    if clsname == "KeywordCall":
         kw_name = node.keyword
         return kw_name and normalize_robot_name(kw_name) == "evaluate"
     else:
-        return node.__class__.__name__ in CLASSES_WTH_EXPRESSION_ARGUMENTS
+        return clsname in _CLASSES_WTH_EXPRESSION_ARGUMENTS_AS_SET
 
 
 def iter_arguments_from_template(
@@ -2225,7 +2641,7 @@ def set_localization_info_in_model(ast, localization_info: LocalizationInfo):
     ast.__localization_info__ = localization_info
 
     file_weak_ref = weakref.ref(ast)
-    for _stack, node in _iter_nodes(ast):
+    for _stack, node in _iter_nodes_recursive(ast):
         node.__file_weak_ref__ = file_weak_ref  # type:ignore
         node.__localization_info__ = localization_info  # type:ignore
 
@@ -1,4 +1,4 @@
-from typing import Optional, Iterator, Tuple
+from typing import Optional, Iterator, Tuple, Dict
 
 from robotframework_ls.impl.protocols import KeywordUsageInfo, IRobotToken
 from robotframework_ls.impl.keywords_in_args import KEYWORD_NAME_TO_KEYWORD_INDEX
@@ -10,6 +10,22 @@ TOK_TYPE_EXPRESSION = 2
 TOK_TYPE_CONTROL = 3
 TOK_TYPE_IGNORE = 4
 
+# Argument types which are not added to the keyword usage tokens.
+_SKIP_TOK_TYPES = frozenset((TOK_TYPE_CONTROL, TOK_TYPE_EXPRESSION, TOK_TYPE_IGNORE))
+
+# Keyword name -> (consider_keyword_at_index, consider_condition_at_index)
+_KEYWORD_NAME_TO_ARGS_AS_KEYWORDS_INDEXES: Dict[
+    str, Tuple[Optional[int], Optional[int]]
+] = {
+    name: (
+        KEYWORD_NAME_TO_KEYWORD_INDEX.get(name),
+        KEYWORD_NAME_TO_CONDITION_INDEX.get(name),
+    )
+    for name in set(KEYWORD_NAME_TO_KEYWORD_INDEX).union(
+        KEYWORD_NAME_TO_CONDITION_INDEX
+    )
+}
+
 
 def _tok_type_as_str(tok_type) -> str:
     if tok_type == TOK_TYPE_NONE:
@@ -52,12 +68,7 @@ class _ConsiderArgsAsKeywordNames:
         elif self._normalized_keyword_name == "foreachinputworkitem":
             self.next_tok_type = self._next_tok_type_for_each_input_work_item
         elif self._normalized_keyword_name == "runkeywords":
-            found = False
-            for token in node.tokens:
-                if "AND" == token.value:
-                    found = True
-                    break
-            if found:
+            if any(token.value == "AND" for token in node.tokens):
                 self.next_tok_type = self._next_tok_type_run_keywords
             else:
                 self.next_tok_type = self._consider_each_arg_as_keyword
@@ -170,19 +181,11 @@ def _create_root_keyword_usage_info(stack, node) -> Optional[KeywordUsageInfo]:
 
     :note: this goes hand-in-hand with get_keyword_name_token.
     """
-    from robot.api import Token
-    from robotframework_ls.impl.ast_utils import (
-        CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET,
-    )
     from robotframework_ls.impl.ast_utils import _strip_node_and_token_bdd_prefix
+    from robotframework_ls.impl.ast_utils import CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE
 
-    if node.__class__.__name__ == "KeywordCall":
-        token_type = Token.KEYWORD
-
-    elif node.__class__.__name__ in CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET:
-        token_type = Token.NAME
-
-    else:
+    token_type = CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE.get(node.__class__.__name__)
+    if token_type is None:
         return None
 
     prefix, node, token = _strip_node_and_token_bdd_prefix(stack, node, token_type)
@@ -196,6 +199,10 @@ def _create_root_keyword_usage_info(stack, node) -> Optional[KeywordUsageInfo]:
 
 
 def _build_keyword_usage(stack, node, current_tokens) -> Optional[KeywordUsageInfo]:
+    """
+    :note: the `current_tokens` list is reused to create the new node (so,
+    callers must not change it afterwards).
+    """
     from robotframework_ls.impl.ast_utils import copy_token_replacing
 
     # Note: just check for line/col because the token could be changed
@@ -203,14 +210,11 @@ def _build_keyword_usage(stack, node, current_tokens) -> Optional[KeywordUsageIn
     if not current_tokens:
         return None
 
-    keyword_at_index = 0
-    keyword_token = current_tokens[keyword_at_index]
-
+    keyword_token = current_tokens[0]
     keyword_token = copy_token_replacing(keyword_token, type=keyword_token.KEYWORD)
-    new_tokens = [keyword_token]
-    new_tokens.extend(current_tokens[keyword_at_index + 1 :])
+    current_tokens[0] = keyword_token
 
-    new_node = node.__class__(new_tokens)
+    new_node = node.__class__(current_tokens)
     return KeywordUsageInfo(
         stack,
         new_node,
@@ -223,33 +227,36 @@ def _build_keyword_usage(stack, node, current_tokens) -> Optional[KeywordUsageIn
 def _iter_keyword_usage_info_uncached_from_args(
     stack, node, args_as_keywords_handler, token_line_col_to_type
 ) -> Iterator[KeywordUsageInfo]:
+    from robot.api import Token
+
+    # Note: bound to locals as this is a hot loop.
+    ARGUMENT = Token.ARGUMENT
+    KEYWORD = TOK_TYPE_KEYWORD
+    next_tok_type_func = args_as_keywords_handler.next_tok_type
+
     # We may have multiple matches, so, we need to setup the appropriate book-keeping
     current_tokens = []
 
     iter_in = iter(node.tokens)
 
     for token in iter_in:
-        if token.type == token.ARGUMENT:
-            next_tok_type = args_as_keywords_handler.next_tok_type(token)
+        if token.type == ARGUMENT:
+            next_tok_type = next_tok_type_func(token)
             token_line_col_to_type[(token.lineno, token.col_offset)] = next_tok_type
-            if next_tok_type == args_as_keywords_handler.KEYWORD:
+            if next_tok_type == KEYWORD:
                 current_tokens.append(token)
                 break
 
     for token in iter_in:
-        if token.type == token.ARGUMENT:
-            next_tok_type = args_as_keywords_handler.next_tok_type(token)
+        if token.type == ARGUMENT:
+            next_tok_type = next_tok_type_func(token)
             token_line_col_to_type[(token.lineno, token.col_offset)] = next_tok_type
 
-            if next_tok_type in (
-                args_as_keywords_handler.CONTROL,
-                args_as_keywords_handler.EXPRESSION,
-                args_as_keywords_handler.IGNORE,
-            ):
+            if next_tok_type in _SKIP_TOK_TYPES:
                 # Don't add IF/ELSE IF/AND nor the condition.
                 continue
 
-            if next_tok_type != args_as_keywords_handler.KEYWORD:
+            if next_tok_type != KEYWORD:
                 # Argument was now added to current_tokens.
                 current_tokens.append(token)
                 continue
@@ -345,16 +352,9 @@ class _KeywordUsageHandler:
 
         # Now, we have the root, determine if it can have other usages inside itself...
         normalized_keyword_name = normalize_robot_name(root_keyword_usage_info.name)
-        consider_keyword_at_index = KEYWORD_NAME_TO_KEYWORD_INDEX.get(
-            normalized_keyword_name
-        )
-        consider_condition_at_index = KEYWORD_NAME_TO_CONDITION_INDEX.get(
-            normalized_keyword_name
-        )
-        if (
-            consider_keyword_at_index is not None
-            or consider_condition_at_index is not None
-        ):
+        indexes = _KEYWORD_NAME_TO_ARGS_AS_KEYWORDS_INDEXES.get(normalized_keyword_name)
+        if indexes is not None:
+            consider_keyword_at_index, consider_condition_at_index = indexes
             args_as_keywords_handler = _ConsiderArgsAsKeywordNames(
                 root_keyword_usage_info.node,
                 normalized_keyword_name,
@@ -385,6 +385,14 @@ class _KeywordUsageHandler:
             (tok.lineno, tok.col_offset), TOK_TYPE_NONE
         )
 
+    def has_token_type(self, tok_type: int) -> bool:
+        """
+        :return: whether some token in the node has the given type (i.e.:
+        TOK_TYPE_EXPRESSION, TOK_TYPE_KEYWORD, ...).
+        """
+        self._ensure_cached()
+        return tok_type in self._token_line_col_to_type.values()
+
     def get_token_type_as_str(self, token: IRobotToken) -> str:
         return _tok_type_as_str(self.get_token_type(token))
 
@@ -407,19 +415,27 @@ class _KeywordUsageHandler:
 
 
 def obtain_keyword_usage_handler(
-    stack, node, recursive=True
+    stack, node, recursive=True, use_cache=True
 ) -> Optional[_KeywordUsageHandler]:
-    from robotframework_ls.impl.ast_utils import (
-        CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET,
-    )
+    """
+    :param use_cache:
+        If True the handler computed for the node in the ast at `stack[0]` is
+        reused (if available).
+    """
+    from robotframework_ls.impl.ast_utils import CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE
 
-    if (
-        node.__class__.__name__ != "KeywordCall"
-        and node.__class__.__name__
-        not in CLASSES_WITH_ARGUMENTS_AS_KEYWORD_CALLS_AS_SET
-    ):
+    if node.__class__.__name__ not in CLSNAME_TO_KEYWORD_NAME_TOKEN_TYPE:
         return None
 
+    if use_cache and stack:
+        from robotframework_ls.impl.ast_utils import get_cached_keyword_usage_handler
+
+        keyword_usage_handler = get_cached_keyword_usage_handler(
+            stack[0], stack, node, recursive
+        )
+        if keyword_usage_handler is not None:
+            return keyword_usage_handler
+
     return _KeywordUsageHandler(stack, node, recursive=recursive)
 
 
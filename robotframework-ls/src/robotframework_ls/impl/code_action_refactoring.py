@@ -1,3 +1,4 @@
+import re
 from typing import Set, Iterable, Any, List
 
 from robotframework_ls.impl.protocols import (
@@ -12,6 +13,8 @@ from robocorp_ls_core.lsp import (
 )
 from robotframework_ls.impl._code_action_utils import wrap_edits_in_snippet
 
+_LEADING_INDENT_RE = re.compile(r"[ \t]+")
+
 
 def _create_local_variable_refactoring(
     completion_context: ICompletionContext,
@@ -34,13 +37,12 @@ def _create_local_variable_refactoring(
             from robotframework_ls.robot_config import (
                 create_convert_keyword_format_func,
             )
-            import re
 
             format_name = create_convert_keyword_format_func(completion_context.config)
             set_var_name = format_name("Set Variable")
             indent = "    "
             line_contents = completion_context.doc.get_line(curr_node_line_0_based)
-            found = re.match("[\s]+", line_contents)
+            found = _LEADING_INDENT_RE.match(line_contents)
             if found:
                 indent = found.group()
 
@@ -108,7 +108,9 @@ def complete(completion_context: ICompletionContext) -> List[CompletionItemTyped
         if robot_match.base and robot_match_start < col < robot_match_end:
             # Now, let's see in which item/offset we're in.
             for rtoken in iter_robot_match_as_tokens(
-                robot_match, relative_index=robot_match_start, lineno=token.lineno
+                robot_match,
+                relative_index=token.col_offset + relative_index,
+                lineno=token.lineno,
             ):
                 if rtoken.type == "[":
                     last_opening_bracket_column = rtoken.col_offset
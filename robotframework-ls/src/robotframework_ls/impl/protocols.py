@@ -13,6 +13,7 @@ from typing import (
     Hashable,
     Dict,
     Set,
+    FrozenSet,
     Union,
 )
 from robocorp_ls_core.protocols import (
@@ -900,6 +901,12 @@ class ILocalizationInfo(Protocol):
         for all languages.
         """
 
+    def get_bdd_prefixes_on_read(self) -> FrozenSet[str]:
+        """
+        Same as `iter_bdd_prefixes_on_read` but provides the (cached) frozenset
+        (which may be used as a key for caches).
+        """
+
     def iter_languages_on_write(
         self,
     ) -> Iterator[Any]:  # Actually Iterator[robot.api.Language]
@@ -1,4 +1,4 @@
-from typing import Tuple, Set, Union, Iterator, Optional, Any
+from typing import Tuple, Set, Union, Iterator, Optional, Any, FrozenSet
 from robocorp_ls_core.robotframework_log import get_logger
 from robotframework_ls.impl.protocols import ILocalizationInfo
 
@@ -28,7 +28,7 @@ class LocalizationInfo:
         self._language_codes: Tuple[str, ...] = language_codes
 
         self._last_bdd_prefixes_cache_key: Optional[Set[str]] = None
-        self._bdd_prefixes: Optional[Set[str]] = None
+        self._bdd_prefixes: Optional[FrozenSet[str]] = None
 
     def __str__(self):
         return f"LocalizationInfo({self._language_codes})"
@@ -94,6 +94,13 @@ class LocalizationInfo:
         language in the file and while reading (i.e.: analyzing) we'd want it
         for all languages.
         """
+        yield from iter(self.get_bdd_prefixes_on_read())
+
+    def get_bdd_prefixes_on_read(self) -> FrozenSet[str]:
+        """
+        Same as `iter_bdd_prefixes_on_read` but provides the (cached) frozenset
+        (which may be used as a key for caches).
+        """
         from robotframework_ls.impl.robot_version import robot_version_supports_language
 
         global_localization_info = get_global_localization_info()
@@ -125,9 +132,9 @@ class LocalizationInfo:
                                 bdd_prefixes.add(prefix.lower())
 
             self._last_bdd_prefixes_cache_key = global_language_codes
-            self._bdd_prefixes = bdd_prefixes
+            self._bdd_prefixes = frozenset(bdd_prefixes)
 
-        yield from iter(self._bdd_prefixes)
+        return self._bdd_prefixes
 
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
@@ -224,6 +224,10 @@ def _tokenize_variables(token: IRobotToken) -> Iterator[IRobotToken]:
                 t.tokenize_variables(), token.type
             )
 
+    elif "{" not in token.value:
+        # Nothing to tokenize.
+        return iter((token,))
+
     else:
         return token.tokenize_variables()
 
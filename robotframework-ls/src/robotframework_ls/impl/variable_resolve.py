@@ -144,6 +144,21 @@ def iter_robot_variable_matches(
     """
     Provides the IRobotVariableMatch and the relative index for the match in the string.
     """
+    return iter(_get_robot_variable_matches(string))
+
+
+# Note: the same strings are searched a lot (and searching is done in pure
+# python in RF), so, the matches are cached.
+@lru_cache(maxsize=2000)
+def _get_robot_variable_matches(
+    string: str,
+) -> Tuple[Tuple[IRobotVariableMatch, int], ...]:
+    return tuple(_iter_robot_variable_matches_uncached(string))
+
+
+def _iter_robot_variable_matches_uncached(
+    string: str,
+) -> Iterator[Tuple[IRobotVariableMatch, int]]:
     # Based on robot.variables.search.VariableIterator
     remaining = string
     relative_index = 0
@@ -27,12 +27,12 @@ def test_impl_recovery_matches_suite():
     test_data = _TestData("test", "source", 0)
     impl.start_test(test_data, result)
 
-    assert len(impl._stack_ctx_entries_deque) == 2
+    assert len(impl._stack_ctx_entries) == 2
 
     # Unsynchronized end suite (clear until we reach it).
     impl.end_suite(suite_data, result)
 
-    assert len(impl._stack_ctx_entries_deque) == 0
+    assert len(impl._stack_ctx_entries) == 0
 
 
 class _Variables:
@@ -69,14 +69,14 @@ def test_impl_recovery_matches_test():
     EXECUTION_CONTEXTS._contexts.append(_Context())
     impl.start_keyword_v2("kwname", keyword_data)
 
-    assert len(impl._stack_ctx_entries_deque) == 3
+    assert len(impl._stack_ctx_entries) == 3
 
     # Unsynchronized end test (clear until we reach it).
     impl.end_test(test_data, result)
-    assert len(impl._stack_ctx_entries_deque) == 1
+    assert len(impl._stack_ctx_entries) == 1
 
     impl.end_suite(suite_data, result)
-    assert len(impl._stack_ctx_entries_deque) == 0
+    assert len(impl._stack_ctx_entries) == 0
 
 
 def test_impl_recovery_does_not_match_test():
@@ -103,15 +103,15 @@ def test_impl_recovery_does_not_match_test():
     EXECUTION_CONTEXTS._contexts.append(_Context())
     impl.start_keyword_v2("kwname", keyword_data)
 
-    assert len(impl._stack_ctx_entries_deque) == 3
+    assert len(impl._stack_ctx_entries) == 3
 
     # Unsynchronized end test (clear all keywords).
     test_data = _TestData("no-match-test", "source", 0)
 
     impl.end_test(test_data, result)
-    assert len(impl._stack_ctx_entries_deque) == 1
+    assert len(impl._stack_ctx_entries) == 1
     impl.end_suite(suite_data, result)
-    assert len(impl._stack_ctx_entries_deque) == 0
+    assert len(impl._stack_ctx_entries) == 0
 
 
 def test_impl_recovery_do_nothing():
@@ -122,4 +122,4 @@ def test_impl_recovery_do_nothing():
     result = _SuiteResult()
 
     impl.end_suite(suite_data, result)
-    assert len(impl._stack_ctx_entries_deque) == 0
+    assert len(impl._stack_ctx_entries) == 0
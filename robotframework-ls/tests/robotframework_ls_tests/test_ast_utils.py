@@ -482,3 +482,84 @@ Keyword 1
     ast = document.get_ast()
     refs = list(ast_utils.iter_variable_references(ast))
     regression_check(data_regression, refs)
+
+
+def test_variable_references_repeated_items():
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl import ast_utils
+
+    document = RobotDocument(
+        "uri",
+        """
+*** Keywords ***
+Keyword 1
+    Log    ${dct}[${key}][${key}]
+""",
+    )
+
+    ast = document.get_ast()
+    refs = list(ast_utils.iter_variable_references(ast))
+    found = sorted(
+        (var_info.token.value, var_info.token.col_offset) for var_info in refs
+    )
+    # Each repeated item must have its own position.
+    assert found == [("dct", 13), ("key", 20), ("key", 28)]
+
+
+def test_collect_errors_order():
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl import ast_utils
+
+    document = RobotDocument(
+        "uri",
+        """*** Invalid ***
+foo
+
+*** Keywords ***
+Keyword 1
+    FOR    ${a}    IN
+    END
+
+Keyword 2
+
+*** Test Cases ***
+Test 1
+    IF
+    END
+""",
+    )
+
+    ast = document.get_ast()
+    # The errors from the File are collected from the indexer (and must be in
+    # the same order as when going through all the nodes).
+    errors = ast_utils.collect_errors(ast)
+    expected_from_walk = []
+    for section in ast.sections:
+        if section.__class__.__name__ == "InvalidSection":
+            expected_from_walk.extend(
+                ast_utils._get_errors_from_tokens(
+                    section.header, ast_utils._get_error_tokens()
+                )
+            )
+        expected_from_walk.extend(ast_utils.collect_errors(section))
+
+    assert [(e.msg, e.start, e.end) for e in errors] == [
+        (e.msg, e.start, e.end) for e in expected_from_walk
+    ]
+    assert [e.start[0] for e in errors] == [0, 5, 5, 8, 12, 12]
+
+
+def test_collect_errors_max_errors():
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl import ast_utils
+
+    document = RobotDocument("uri", "*** foo bar ***\n" * (ast_utils.MAX_ERRORS * 3))
+
+    ast = document.get_ast()
+    errors = ast_utils.collect_errors(ast)
+    assert len(errors) == ast_utils.MAX_ERRORS
+    assert [e.start[0] for e in errors] == list(range(ast_utils.MAX_ERRORS))
+
+    # Sections after the ones needed to reach MAX_ERRORS aren't indexed.
+    last_section = ast.sections[-1]
+    assert getattr(last_section, "__ast_indexer__", None) is None